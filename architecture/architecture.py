@@ -6,6 +6,9 @@ This module provides a high-level view of the system's architecture,
 outlining its core components and interactions.
 """
 
+from architecture.backtest_Engine import BacktestEngine
+from models.performance_Model import PerformanceModel
+
 class CoreAIEngine:
     """
     The Core AI Engine is responsible for developing, training, and optimizing trading strategies.
@@ -25,9 +28,12 @@ class BacktestingEnvironment:
     This component provides a simulation environment to test trading strategies
     before deploying them in live markets.
     """
-    def simulate(self, strategy, market_data):
+    def __init__(self, cost_model=None, initial_capital: float = 1.0, periods_per_year: float = 365.0):
+        self.engine = BacktestEngine(cost_model, initial_capital, periods_per_year)
+
+    def simulate(self, strategy, market_data) -> PerformanceModel:
         """Run a backtest on a given strategy with historical market data."""
-        pass
+        return self.engine.run(strategy, market_data).performance
 
 
 class DeploymentInfrastructure:
@@ -0,0 +1,190 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from architecture.portfolio_Manager import DEFAULT_HYPERPARAMETERS
+from core.config_cache import load_yaml_config
+from models.performance_Model import PerformanceModel
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """
+    Proportional trading cost shared by both backtest paths.
+
+    Each unit of turnover (change in position weight) pays `fee_rate` plus
+    `slippage`, both as fractions of traded notional.
+    """
+    fee_rate: float = 0.001
+    slippage: float = 0.005
+
+    @classmethod
+    def from_hyperparameters(cls, fee_rate: float = 0.001,
+                             path: Union[str, Path] = DEFAULT_HYPERPARAMETERS) -> "CostModel":
+        """Use `trade_model.slippage_tolerance` from the hyperparameters file as slippage."""
+        hyperparameters = load_yaml_config(path)
+        return cls(fee_rate, float(hyperparameters["trade_model"]["slippage_tolerance"]))
+
+    @property
+    def rate(self) -> float:
+        return self.fee_rate + self.slippage
+
+    def cost(self, turnover):
+        """Cost as a fraction of equity for a turnover (scalar or array)."""
+        return turnover * self.rate
+
+
+@dataclass
+class BacktestState:
+    """
+    What an event-driven strategy sees on each bar.
+    """
+    index: int
+    prices: np.ndarray
+    equity: float
+    weight: float
+
+    @property
+    def price(self) -> float:
+        return float(self.prices[self.index])
+
+    @property
+    def history(self) -> np.ndarray:
+        """Prices up to and including the current bar (no look-ahead)."""
+        return self.prices[:self.index + 1]
+
+
+@dataclass
+class BacktestResult:
+    performance: PerformanceModel
+    equity: np.ndarray
+    returns: np.ndarray
+    weights: np.ndarray
+
+
+class BacktestEngine:
+    """
+    Single-asset backtester over close prices.
+
+    A strategy produces a target position weight per bar (1 = fully long,
+    -1 = fully short). The weight chosen at bar t's close earns the return
+    from t to t+1, and every change in weight pays the CostModel rate.
+
+    Strategies are either vectorized, an array of weights or a callable
+    mapping the price array to one, run entirely in NumPy, or event-driven,
+    an object with `on_bar(state) -> Optional[float]` (None keeps the
+    current weight), run bar by bar for path-dependent logic. Both paths
+    apply identical accounting, so the same signals give the same result.
+    """
+    def __init__(self, cost_model: Optional[CostModel] = None, initial_capital: float = 1.0,
+                 periods_per_year: float = 365.0):
+        self.cost_model = cost_model or CostModel.from_hyperparameters()
+        self.initial_capital = initial_capital
+        self.periods_per_year = periods_per_year
+
+    def run(self, strategy: Any, market_data: Any) -> BacktestResult:
+        """Backtest a vectorized or event-driven strategy against prices or OHLCV bars."""
+        prices = self._prices(market_data)
+        if hasattr(strategy, "on_bar"):
+            weights, returns = self._run_events(strategy, prices)
+        else:
+            signals = strategy(prices) if callable(strategy) else strategy
+            weights, returns = self._run_vectorized(np.asarray(signals, dtype=np.float64), prices)
+        equity = self.initial_capital * np.cumprod(1.0 + returns)
+        return BacktestResult(
+            performance=self._performance(market_data, equity, returns, weights),
+            equity=equity,
+            returns=returns,
+            weights=weights,
+        )
+
+    def _run_vectorized(self, weights: np.ndarray, prices: np.ndarray):
+        if weights.shape != prices.shape:
+            raise ValueError(f"Expected {len(prices)} signals, got {weights.shape}")
+        returns = np.zeros_like(prices)
+        # Weight held over (t-1, t] times the asset's return over the same bar
+        np.divide(prices[1:], prices[:-1], out=returns[1:])
+        returns[1:] -= 1.0
+        returns[1:] *= weights[:-1]
+        turnover = np.abs(np.diff(weights, prepend=0.0))
+        returns -= self.cost_model.cost(turnover)
+        return weights, returns
+
+    def _run_events(self, strategy, prices: np.ndarray):
+        n = len(prices)
+        weights = np.zeros(n)
+        returns = np.zeros(n)
+        rate = self.cost_model.rate
+        weight, equity = 0.0, self.initial_capital
+        state = BacktestState(0, prices, equity, weight)
+        for i in range(n):
+            bar_return = weight * (prices[i] / prices[i - 1] - 1.0) if i else 0.0
+            state.index, state.equity, state.weight = i, equity * (1.0 + bar_return), weight
+            target = strategy.on_bar(state)
+            if target is not None and target != weight:
+                bar_return -= abs(target - weight) * rate
+                weight = float(target)
+            equity *= 1.0 + bar_return
+            weights[i] = weight
+            returns[i] = bar_return
+        return weights, returns
+
+    def _performance(self, market_data, equity: np.ndarray, returns: np.ndarray,
+                     weights: np.ndarray) -> PerformanceModel:
+        if len(equity):
+            peak = np.maximum.accumulate(np.maximum(equity, self.initial_capital))
+            max_drawdown = float(np.max(1.0 - equity / peak))
+            total_return = float(equity[-1] / self.initial_capital - 1.0)
+            std = float(returns.std())
+            mean = float(returns.mean())
+        else:
+            max_drawdown = total_return = std = mean = 0.0
+        annualization = math.sqrt(self.periods_per_year)
+        turnover = np.abs(np.diff(weights, prepend=0.0))
+        return PerformanceModel(
+            timestamp=self._end_time(market_data),
+            total_return=total_return,
+            volatility=std * annualization,
+            max_drawdown=max_drawdown,
+            metrics={
+                "sharpe_ratio": mean / std * annualization if std > 0 else 0.0,
+                "final_equity": float(equity[-1]) if len(equity) else self.initial_capital,
+                "turnover": float(turnover.sum()),
+                "total_cost": float(self.cost_model.cost(turnover).sum()),
+                "trades": int(np.count_nonzero(turnover)),
+                "bars": int(len(equity)),
+            },
+        )
+
+    @staticmethod
+    def _prices(market_data) -> np.ndarray:
+        if isinstance(market_data, pd.DataFrame):
+            market_data = market_data["close"].to_numpy()
+        prices = np.ascontiguousarray(market_data, dtype=np.float64)
+        if prices.ndim != 1:
+            raise ValueError("Expected a 1-D price series")
+        return prices
+
+    @staticmethod
+    def _end_time(market_data) -> datetime:
+        if isinstance(market_data, pd.DataFrame) and "timestamp" in market_data and len(market_data):
+            return pd.Timestamp(market_data["timestamp"].iloc[-1]).to_pydatetime()
+        return datetime.utcnow()
+
+
+def moving_average_crossover(fast: int = 10, slow: int = 50) -> Callable[[np.ndarray], np.ndarray]:
+    """Example vectorized strategy: long while the fast SMA is above the slow SMA."""
+    def signals(prices: np.ndarray) -> np.ndarray:
+        cumsum = np.concatenate(([0.0], np.cumsum(prices)))
+        weights = np.zeros_like(prices)
+        if len(prices) >= slow:
+            fast_sma = (cumsum[slow:] - cumsum[slow - fast:-fast]) / fast
+            slow_sma = (cumsum[slow:] - cumsum[:-slow]) / slow
+            weights[slow - 1:] = (fast_sma > slow_sma).astype(np.float64)
+        return weights
+    return signals
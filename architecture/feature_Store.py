@@ -0,0 +1,200 @@
+import math
+import sqlite3
+from collections import deque
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+FEATURES = ("sma_10", "sma_50", "rsi_14")
+
+DateLike = Union[str, date, pd.Timestamp]
+
+
+def _day(value: DateLike) -> str:
+    return pd.Timestamp(value).date().isoformat()
+
+
+class IndicatorState:
+    """
+    Rolling-window state for one symbol.
+
+    Matches sql/feature_Engineering.sql: SMAs average the last 10/50 closes
+    (fewer at the start of a series) and RSI-14 compares the sums of gains
+    and losses in the last 14 daily returns. Each bar updates running sums
+    in O(1).
+    """
+    def __init__(self):
+        self.closes: deque = deque(maxlen=50)
+        self.returns: deque = deque(maxlen=14)
+        self.sum_10 = 0.0
+        self.sum_50 = 0.0
+        self.gains = 0.0
+        self.losses = 0.0
+        self.count = 0
+        self.last_date: Optional[str] = None
+
+    def update(self, close: float, daily_return: Optional[float] = None) -> Dict[str, Optional[float]]:
+        if daily_return is None:
+            daily_return = close / self.closes[-1] - 1.0 if self.closes else 0.0
+
+        if len(self.closes) >= 10:
+            self.sum_10 -= self.closes[-10]
+        if len(self.closes) == self.closes.maxlen:
+            self.sum_50 -= self.closes[0]
+        self.closes.append(close)
+        self.sum_10 += close
+        self.sum_50 += close
+
+        if len(self.returns) == self.returns.maxlen:
+            leaving = self.returns[0]
+            self.gains -= max(leaving, 0.0)
+            self.losses -= max(-leaving, 0.0)
+        self.returns.append(daily_return)
+        self.gains += max(daily_return, 0.0)
+        self.losses += max(-daily_return, 0.0)
+
+        # Resum exactly once per window length so floating-point drift cannot build up
+        self.count += 1
+        if self.count % self.closes.maxlen == 0:
+            self.sum_10 = math.fsum(list(self.closes)[-10:])
+            self.sum_50 = math.fsum(self.closes)
+            self.gains = math.fsum(max(r, 0.0) for r in self.returns)
+            self.losses = math.fsum(max(-r, 0.0) for r in self.returns)
+        return self.values()
+
+    def values(self) -> Dict[str, Optional[float]]:
+        n = len(self.closes)
+        if self.losses > 1e-15:
+            rsi = 100.0 - 100.0 / (1.0 + self.gains / self.losses)
+        else:
+            rsi = 100.0 if self.gains > 0 else None
+        return {
+            "sma_10": self.sum_10 / min(n, 10) if n else None,
+            "sma_50": self.sum_50 / n if n else None,
+            "rsi_14": rsi,
+        }
+
+
+class FeatureStore:
+    """
+    Incrementally maintained SMA-10, SMA-50 and RSI-14 features.
+
+    New bars update per-symbol rolling state and are written to a SQLite
+    `market_features` table keyed by (symbol, trade_date), so the nightly
+    job only processes bars it has not seen. Training and live agents read
+    the same table: `get_features(symbol, as_of)` returns the latest row on
+    or before `as_of`, which never looks ahead.
+    """
+    def __init__(self, path: Union[str, Path] = "./data/features.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS market_features ("
+            " symbol TEXT NOT NULL, trade_date TEXT NOT NULL,"
+            " close_price REAL, daily_return REAL,"
+            " sma_10 REAL, sma_50 REAL, rsi_14 REAL,"
+            " PRIMARY KEY (symbol, trade_date))"
+        )
+        self.conn.commit()
+        self._states: Dict[str, IndicatorState] = {}
+
+    def add_bar(self, symbol: str, trade_date: DateLike, close: float,
+                daily_return: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """Append one bar and return its features; bars must arrive in date order."""
+        features = self._update(symbol, _day(trade_date), close, daily_return)
+        self.conn.commit()
+        return features
+
+    def add_bars(self, bars: pd.DataFrame) -> int:
+        """
+        Append bars shaped like `market_returns` (trade_date, symbol,
+        close_price, optional daily_return). Bars already stored are
+        skipped, so reloading overlapping history is safe. Returns the
+        number of new bars.
+        """
+        added = 0
+        frame = bars.assign(trade_date=pd.to_datetime(bars["trade_date"]).dt.date.astype(str))
+        for symbol, group in frame.sort_values("trade_date").groupby("symbol", sort=False):
+            state = self._state(symbol)
+            fresh = group[group["trade_date"] > state.last_date] if state.last_date else group
+            returns = fresh["daily_return"] if "daily_return" in fresh else [None] * len(fresh)
+            for day, close, daily_return in zip(fresh["trade_date"], fresh["close_price"], returns):
+                if daily_return is not None and pd.isna(daily_return):
+                    daily_return = None
+                self._update(symbol, day, float(close), daily_return)
+                added += 1
+        self.conn.commit()
+        return added
+
+    def latest(self, symbol: str) -> Dict[str, Optional[float]]:
+        """Features after the most recent bar, from in-memory state."""
+        return self._state(symbol).values()
+
+    def get_features(self, symbol: str, as_of: DateLike) -> Optional[Dict]:
+        """Point-in-time feature vector: the latest stored bar on or before `as_of`."""
+        row = self.conn.execute(
+            "SELECT trade_date, sma_10, sma_50, rsi_14 FROM market_features"
+            " WHERE symbol = ? AND trade_date <= ? ORDER BY trade_date DESC LIMIT 1",
+            (symbol, _day(as_of)),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"symbol": symbol, "trade_date": row[0], **dict(zip(FEATURES, row[1:]))}
+
+    def get_feature_matrix(self, symbols: Iterable[str], as_of: DateLike) -> pd.DataFrame:
+        """Point-in-time features for many symbols as one frame indexed by symbol."""
+        rows = [self.get_features(symbol, as_of) for symbol in symbols]
+        frame = pd.DataFrame([r for r in rows if r is not None], columns=["symbol", "trade_date", *FEATURES])
+        return frame.set_index("symbol")
+
+    def history(self, symbol: Optional[str] = None, start: Optional[DateLike] = None,
+                end: Optional[DateLike] = None) -> pd.DataFrame:
+        """Stored rows (the `market_features` layout) for training, optionally filtered."""
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if start is not None:
+            clauses.append("trade_date >= ?")
+            params.append(_day(start))
+        if end is not None:
+            clauses.append("trade_date <= ?")
+            params.append(_day(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return pd.read_sql_query(
+            f"SELECT * FROM market_features{where} ORDER BY symbol, trade_date", self.conn, params=params
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def _update(self, symbol: str, day: str, close: float, daily_return: Optional[float]) -> Dict:
+        state = self._state(symbol)
+        if state.last_date is not None and day <= state.last_date:
+            raise ValueError(f"{symbol}: bar for {day} is not after {state.last_date}")
+        features = state.update(close, daily_return)
+        state.last_date = day
+        self.conn.execute(
+            "INSERT INTO market_features VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (symbol, day, close, state.returns[-1], *(features[name] for name in FEATURES)),
+        )
+        return features
+
+    def _state(self, symbol: str) -> IndicatorState:
+        state = self._states.get(symbol)
+        if state is None:
+            # Rebuild the rolling windows from the last stored bars
+            state = IndicatorState()
+            rows = self.conn.execute(
+                "SELECT trade_date, close_price, daily_return FROM market_features"
+                " WHERE symbol = ? ORDER BY trade_date DESC LIMIT 50",
+                (symbol,),
+            ).fetchall()
+            for day, close, daily_return in reversed(rows):
+                state.update(close, daily_return)
+                state.last_date = day
+            self._states[symbol] = state
+        return state
@@ -1,19 +1,258 @@
+import os
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from architecture.market_Stream import MarketDataBus, Subscription
+from architecture.order_Book import OrderBook
+from architecture.tick_Store import TickStore
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
 class MarketDataProvider:
     """
     Connects to on-chain or centralized exchange APIs to retrieve
     real-time and historical market data.
+
+    Historical OHLCV bars are cached on disk as Parquet files partitioned by
+    symbol and UTC day (`<cache_dir>/ohlcv/symbol=<symbol>/date=<day>.parquet`).
+    A range query only reads the partitions it needs and only asks the
+    sources for the days that are not cached yet.
+
+    Raw ticks live in a memory-mapped TickStore under `<cache_dir>/ticks`
+    and are returned as zero-copy NumPy views.
+
+    Live data is pushed through a shared MarketDataBus: one upstream stream
+    per (source, symbol) fans out to every subscribed agent. Order books
+    are kept per symbol and updated in place from feed deltas.
     """
     def __init__(self, sources: List[str], cache_dir: str = "./data/cache"):
-        pass
+        self.sources = list(sources)
+        self.cache_dir = Path(cache_dir)
+        self.ticks = TickStore(str(self.cache_dir / "ticks"))
+        self.bus = MarketDataBus()
+        self.books: Dict[str, OrderBook] = {}
+        self._historical_fetchers: Dict[str, Callable[[str, datetime, datetime], pd.DataFrame]] = {}
+        self._live_fetchers: Dict[str, Callable[[str], Dict]] = {}
+
+    def register_source(
+        self,
+        name: str,
+        historical: Optional[Callable[[str, datetime, datetime], pd.DataFrame]] = None,
+        live: Optional[Callable[[str], Dict]] = None,
+        stream=None,
+    ):
+        """
+        Attach fetch functions to a source name listed in `sources`.
+
+        `historical(symbol, start, end)` returns OHLCV bars in [start, end)
+        with the columns in OHLCV_COLUMNS; `live(symbol)` returns the latest tick;
+        `stream` is a feed with an async `stream(symbol)` tick generator
+        (e.g. `SimulatedFeed`).
+        """
+        if historical is not None:
+            self._historical_fetchers[name] = historical
+        if live is not None:
+            self._live_fetchers[name] = live
+        if stream is not None:
+            self.bus.register_source(stream, name)
 
     def fetch_live(self, symbol: str) -> Dict:
-        """Return the latest tick data for a given symbol."""
-        pass
+        """
+        Return the latest tick data for a given symbol.
+
+        Symbols with an active stream are answered from the bus without an
+        upstream request.
+        """
+        for source in self.sources:
+            if self.bus.is_streaming(source, symbol):
+                tick = self.bus.latest(source, symbol)
+                if tick is not None:
+                    return tick
+        for source in self.sources:
+            fetcher = self._live_fetchers.get(source)
+            if fetcher is not None:
+                return fetcher(symbol)
+        raise LookupError(f"No live source registered for {symbol}")
+
+    def order_book(self, symbol: str) -> OrderBook:
+        """Return the live order book for a symbol, creating an empty one on first use."""
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        return book
+
+    def subscribe(self, symbol: str, source: Optional[str] = None, maxsize: Optional[int] = None) -> Subscription:
+        """
+        Subscribe to pushed live ticks for a symbol.
+
+        Uses the first streaming source in `sources` unless `source` is given.
+        Must be called from a running event loop.
+        """
+        if source is None:
+            source = next((s for s in self.sources if self.bus.has_source(s)), None)
+            if source is None:
+                raise LookupError(f"No streaming source registered for {symbol}")
+        return self.bus.subscribe(source, symbol, maxsize)
+
+    def fetch_historical(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        as_ticks: bool = False,
+    ) -> Union[pd.DataFrame, np.ndarray]:
+        """
+        Return OHLCV or order-book snapshots over a time range.
+
+        Bars with `start <= timestamp < end` are returned, sorted by time.
+        Only days missing from the cache (and the current, still incomplete
+        UTC day) are fetched from the sources; completed days with bars are
+        persisted. Days a source returned nothing for are not cached, so bars
+        that arrive late are picked up by a later query.
+
+        With `as_ticks`, the stored ticks in the range are returned instead
+        as a zero-copy view of the tick store. Timezone-aware bounds are
+        converted to UTC; naive ones are taken as UTC.
+        """
+        start, end = _naive_utc(start), _naive_utc(end)
+        if as_ticks:
+            return self.ticks.read(symbol, start, end)
+
+        days = list(self._days(start, end))
+        today = datetime.utcnow().date()
+        missing = [d for d in days if d >= today or not self._partition_path(symbol, d).exists()]
+
+        fetched: Dict[date, pd.DataFrame] = {}
+        for first, last in self._contiguous_ranges(missing):
+            frame = self._fetch_from_sources(
+                symbol,
+                datetime.combine(first, time.min),
+                datetime.combine(last + timedelta(days=1), time.min),
+            )
+            by_day = dict(tuple(frame.groupby(frame["timestamp"].dt.date)))
+            for day in self._days_between(first, last):
+                day_frame = by_day.get(day, frame.iloc[0:0])
+                fetched[day] = day_frame
+                if day < today and not day_frame.empty:
+                    self._write_partition(symbol, day, day_frame)
+
+        frames = [fetched[d] if d in fetched else self._read_partition(symbol, d) for d in days]
+        result = pd.concat(frames, ignore_index=True) if frames else _empty_ohlcv()
+        mask = (result["timestamp"] >= pd.Timestamp(start)) & (result["timestamp"] < pd.Timestamp(end))
+        return result.loc[mask].sort_values("timestamp").reset_index(drop=True)
+
+    def iter_ticks(self, symbol: str, start: datetime, end: datetime, window: timedelta) -> Iterator[np.ndarray]:
+        """Stream stored ticks as zero-copy views of consecutive `window`-long slices."""
+        return self.ticks.iter_chunks(symbol, _naive_utc(start), _naive_utc(end), window)
+
+    def clear_cache(self, max_bytes: Optional[int] = None, symbol: Optional[str] = None) -> int:
+        """
+        Empty the local cache to free up disk or force fresh pulls.
+
+        With `max_bytes`, only the least recently used partitions are evicted
+        until the cache fits; `symbol` restricts the eviction to one symbol.
+        Returns the number of partitions removed.
+        """
+        root = self.cache_dir / "ohlcv"
+        if symbol is not None:
+            root = root / f"symbol={quote(symbol, safe='')}"
+        if not root.exists():
+            return 0
+
+        partitions = [(p, p.stat()) for p in root.rglob("*.parquet")]
+        # Reads refresh a partition's mtime, so the oldest mtime is least recently used
+        partitions.sort(key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in partitions)
+
+        removed = 0
+        for path, stat in partitions:
+            if max_bytes is not None and total <= max_bytes:
+                break
+            path.unlink()
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def _fetch_from_sources(self, symbol: str, start: datetime, end: datetime) -> pd.DataFrame:
+        errors = []
+        for source in self.sources:
+            fetcher = self._historical_fetchers.get(source)
+            if fetcher is None:
+                continue
+            try:
+                return _normalize_ohlcv(fetcher(symbol, start, end))
+            except Exception as e:
+                errors.append(f"{source}: {e}")
+        raise LookupError(f"No source could provide {symbol} from {start} to {end}: {errors}")
+
+    def _partition_path(self, symbol: str, day: date) -> Path:
+        return self.cache_dir / "ohlcv" / f"symbol={quote(symbol, safe='')}" / f"date={day.isoformat()}.parquet"
+
+    def _write_partition(self, symbol: str, day: date, frame: pd.DataFrame):
+        path = self._partition_path(symbol, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        frame.reset_index(drop=True).to_parquet(tmp_path, index=False)
+        # Atomic rename so concurrent readers never see a half-written file
+        os.replace(tmp_path, path)
+
+    def _read_partition(self, symbol: str, day: date) -> pd.DataFrame:
+        path = self._partition_path(symbol, day)
+        frame = pd.read_parquet(path)
+        os.utime(path)
+        return frame
+
+    @staticmethod
+    def _days(start: datetime, end: datetime) -> Iterator[date]:
+        if end <= start:
+            return iter(())
+        last = (end - timedelta(microseconds=1)).date()
+        return MarketDataProvider._days_between(start.date(), last)
+
+    @staticmethod
+    def _days_between(first: date, last: date) -> Iterator[date]:
+        day = first
+        while day <= last:
+            yield day
+            day += timedelta(days=1)
+
+    @staticmethod
+    def _contiguous_ranges(days: List[date]) -> List[Tuple[date, date]]:
+        ranges: List[Tuple[date, date]] = []
+        for day in days:
+            if ranges and day - ranges[-1][1] == timedelta(days=1):
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        return ranges
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Convert a datetime to naive UTC, the form cached bars are stored in."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.to_pydatetime()
+
+
+def _empty_ohlcv() -> pd.DataFrame:
+    return _normalize_ohlcv(pd.DataFrame(columns=OHLCV_COLUMNS))
 
-    def fetch_historical(self, symbol: str, start: datetime, end: datetime) -> pd.DataFrame:
-        """Return OHLCV or order-book snapshots over a time range."""
-        pass
 
-    def clear_cache(self):
-        """Empty the local cache to free up disk or force fresh pulls."""
-        pass
+def _normalize_ohlcv(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a source's bars to the cached column set and dtypes."""
+    frame = frame.reset_index() if "timestamp" not in frame.columns else frame
+    frame = frame[OHLCV_COLUMNS].copy()
+    timestamps = pd.to_datetime(frame["timestamp"])
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+    frame["timestamp"] = timestamps.astype("datetime64[ns]")
+    for column in OHLCV_COLUMNS[1:]:
+        frame[column] = frame[column].astype("float64")
+    return frame
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("KQI Market Stream")
+
+
+class LatencyCounter:
+    """
+    Running count, mean and max of one hop's latency, in seconds.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {"count": self.count, "mean": self.mean, "max": self.max}
+
+
+class SimulatedFeed:
+    """
+    Local random-walk tick source for tests and dry runs.
+
+    Streams `{"symbol", "price", "size", "timestamp"}` ticks every `interval` seconds.
+    """
+    def __init__(self, name: str = "simulated", interval: float = 0.01, start_price: float = 100.0,
+                 volatility: float = 0.001, seed: Optional[int] = None):
+        self.name = name
+        self.interval = interval
+        self.start_price = start_price
+        self.volatility = volatility
+        self._random = random.Random(seed)
+
+    async def stream(self, symbol: str) -> AsyncIterator[Dict]:
+        price = self.start_price
+        while True:
+            price *= 1 + self._random.gauss(0, self.volatility)
+            yield {
+                "symbol": symbol,
+                "price": price,
+                "size": self._random.expovariate(1.0),
+                "timestamp": time.time(),
+            }
+            await asyncio.sleep(self.interval)
+
+
+class Subscription:
+    """
+    One consumer's bounded view of a (source, symbol) stream.
+
+    When the consumer falls behind and the buffer is full, the oldest tick is
+    dropped so a slow agent never blocks the feed or sees stale prices first.
+    """
+    def __init__(self, bus: "MarketDataBus", key: Tuple[str, str], maxsize: int):
+        self.bus = bus
+        self.key = key
+        self.delivered = 0
+        self.dropped = 0
+        self.queue_latency = LatencyCounter()
+        self._buffer: deque = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def _put(self, tick: Dict, enqueued_at: float):
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append((enqueued_at, tick))
+        self._ready.set()
+
+    async def get(self) -> Dict:
+        """Wait for and return the next tick; raises StopAsyncIteration once closed and drained."""
+        while not self._buffer:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        enqueued_at, tick = self._buffer.popleft()
+        self.queue_latency.record(time.perf_counter() - enqueued_at)
+        self.delivered += 1
+        return tick
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict:
+        return await self.get()
+
+    def close(self):
+        """Stop receiving ticks; the upstream stops when its last subscriber leaves."""
+        if not self._closed:
+            self._closed = True
+            self._ready.set()
+            self.bus.unsubscribe(self)
+
+    def stats(self) -> Dict:
+        return {
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "buffered": len(self._buffer),
+            "queue_latency": self.queue_latency.to_dict(),
+        }
+
+
+class MarketDataBus:
+    """
+    In-process pub/sub for live ticks.
+
+    Exactly one upstream stream runs per (source, symbol) no matter how many
+    agents subscribe; each tick is fanned out to every subscriber's bounded
+    buffer. Latency is tracked per hop: source (tick timestamp to receipt),
+    fanout (receipt until every buffer holds it) and queue (buffer to consumer).
+    """
+    def __init__(self, queue_size: int = 1024):
+        self.queue_size = queue_size
+        self._sources: Dict[str, object] = {}
+        self._subscribers: Dict[Tuple[str, str], List[Subscription]] = {}
+        self._upstreams: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._latest: Dict[Tuple[str, str], Dict] = {}
+        self._received: Dict[Tuple[str, str], int] = {}
+        self._source_latency: Dict[Tuple[str, str], LatencyCounter] = {}
+        self._fanout_latency: Dict[Tuple[str, str], LatencyCounter] = {}
+
+    def register_source(self, source, name: Optional[str] = None):
+        """Register a feed exposing an async `stream(symbol)` generator, under `name` or `source.name`."""
+        self._sources[name or source.name] = source
+
+    def has_source(self, name: str) -> bool:
+        return name in self._sources
+
+    def subscribe(self, source: str, symbol: str, maxsize: Optional[int] = None) -> Subscription:
+        """Subscribe to a (source, symbol) stream, starting the upstream if needed."""
+        if source not in self._sources:
+            raise KeyError(f"Unknown market data source: {source}")
+        key = (source, symbol)
+        subscription = Subscription(self, key, maxsize or self.queue_size)
+        self._subscribers.setdefault(key, []).append(subscription)
+        if key not in self._upstreams:
+            self._source_latency[key] = LatencyCounter()
+            self._fanout_latency[key] = LatencyCounter()
+            self._received[key] = 0
+            self._upstreams[key] = asyncio.ensure_future(self._pump(key))
+            logger.info(f"Started upstream for {symbol} on {source}")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.key, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+        if not subscribers:
+            self._subscribers.pop(subscription.key, None)
+            upstream = self._upstreams.pop(subscription.key, None)
+            if upstream is not None:
+                upstream.cancel()
+                logger.info(f"Stopped upstream for {subscription.key[1]} on {subscription.key[0]}")
+
+    def latest(self, source: str, symbol: str) -> Optional[Dict]:
+        """Return the most recent tick seen on an active stream."""
+        return self._latest.get((source, symbol))
+
+    def is_streaming(self, source: str, symbol: str) -> bool:
+        return (source, symbol) in self._upstreams
+
+    async def _pump(self, key: Tuple[str, str]):
+        source, symbol = key
+        try:
+            async for tick in self._sources[source].stream(symbol):
+                received_at = time.perf_counter()
+                if "timestamp" in tick:
+                    self._source_latency[key].record(max(time.time() - tick["timestamp"], 0.0))
+                self._received[key] += 1
+                self._latest[key] = tick
+                for subscription in self._subscribers.get(key, ()):
+                    subscription._put(tick, received_at)
+                self._fanout_latency[key].record(time.perf_counter() - received_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Upstream for {symbol} on {source} failed: {e}")
+        else:
+            logger.info(f"Upstream for {symbol} on {source} ended")
+        # The stream stopped on its own: drop it and end every subscription
+        if self._upstreams.get(key) is asyncio.current_task():
+            del self._upstreams[key]
+        for subscription in list(self._subscribers.get(key, ())):
+            subscription.close()
+
+    def stats(self) -> Dict:
+        """Per-stream tick counts and per-hop latency counters."""
+        return {
+            f"{source}:{symbol}": {
+                "received": self._received.get((source, symbol), 0),
+                "subscribers": len(self._subscribers.get((source, symbol), ())),
+                "source_latency": self._source_latency[(source, symbol)].to_dict(),
+                "fanout_latency": self._fanout_latency[(source, symbol)].to_dict(),
+                "subscriptions": [s.stats() for s in self._subscribers.get((source, symbol), ())],
+            }
+            for source, symbol in self._source_latency
+        }
+
+    async def close(self):
+        """Cancel every upstream stream."""
+        upstreams = list(self._upstreams.values())
+        self._upstreams.clear()
+        for upstream in upstreams:
+            upstream.cancel()
+        await asyncio.gather(*upstreams, return_exceptions=True)
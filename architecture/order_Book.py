@@ -0,0 +1,187 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BID = "bid"
+ASK = "ask"
+
+
+class SequenceGapError(ValueError):
+    """Raised when a delta skips sequence numbers; the book needs a fresh snapshot."""
+
+
+class _BookSide:
+    """
+    One side of the book as parallel sorted arrays of keys and sizes.
+
+    Keys are prices for asks and negated prices for bids, so index 0 is
+    always the best level and both sides share the same code. Lookups are
+    binary searches; inserts and removals shift a contiguous array.
+    """
+    def __init__(self, sign: int):
+        self.sign = sign
+        self.keys: List[float] = []
+        self.sizes: List[float] = []
+
+    def set(self, price: float, size: float):
+        key = self.sign * price
+        i = bisect_left(self.keys, key)
+        found = i < len(self.keys) and self.keys[i] == key
+        if size <= 0:
+            if found:
+                del self.keys[i]
+                del self.sizes[i]
+        elif found:
+            self.sizes[i] = size
+        else:
+            self.keys.insert(i, key)
+            self.sizes.insert(i, size)
+
+    def size_at(self, price: float) -> float:
+        key = self.sign * price
+        i = bisect_left(self.keys, key)
+        return self.sizes[i] if i < len(self.keys) and self.keys[i] == key else 0.0
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        return (self.sign * self.keys[0], self.sizes[0]) if self.keys else None
+
+    def levels(self, count: Optional[int] = None) -> List[Tuple[float, float]]:
+        count = len(self.keys) if count is None else count
+        return [(self.sign * k, s) for k, s in zip(self.keys[:count], self.sizes[:count])]
+
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+
+
+class OrderBook:
+    """
+    Level-2 order book maintained from a snapshot plus incremental deltas.
+
+    Top-of-book, depth-at-price and VWAP-to-size queries read the sorted
+    level arrays directly instead of rebuilding frames, so they are cheap
+    enough to run on every tick.
+    """
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.sequence = 0
+        self._bids = _BookSide(-1)
+        self._asks = _BookSide(1)
+
+    def _side(self, side: str) -> _BookSide:
+        if side == BID:
+            return self._bids
+        if side == ASK:
+            return self._asks
+        raise ValueError(f"Side must be '{BID}' or '{ASK}'")
+
+    def apply_snapshot(
+        self,
+        bids: Iterable[Tuple[float, float]],
+        asks: Iterable[Tuple[float, float]],
+        sequence: int = 0,
+    ):
+        """Replace the whole book with a snapshot of (price, size) levels."""
+        for side, levels in ((self._bids, bids), (self._asks, asks)):
+            ordered = sorted((side.sign * price, size) for price, size in levels if size > 0)
+            side.keys = [key for key, _ in ordered]
+            side.sizes = [size for _, size in ordered]
+        self.sequence = sequence
+
+    def apply_delta(self, side: str, price: float, size: float, sequence: Optional[int] = None) -> bool:
+        """
+        Set the size of one price level; a size of 0 removes the level.
+
+        With a `sequence`, stale deltas are ignored (returns False) and a gap
+        raises SequenceGapError.
+        """
+        if sequence is not None and not self._accept(sequence):
+            return False
+        self._side(side).set(price, size)
+        return True
+
+    def apply_deltas(self, deltas: Iterable[Tuple[str, float, float]], sequence: Optional[int] = None) -> bool:
+        """Apply a batch of (side, price, size) deltas sharing one sequence number."""
+        if sequence is not None and not self._accept(sequence):
+            return False
+        for side, price, size in deltas:
+            self._side(side).set(price, size)
+        return True
+
+    def _accept(self, sequence: int) -> bool:
+        if sequence <= self.sequence:
+            return False
+        if sequence != self.sequence + 1:
+            raise SequenceGapError(
+                f"{self.symbol}: expected sequence {self.sequence + 1}, got {sequence}"
+            )
+        self.sequence = sequence
+        return True
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        return self._bids.best()
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        return self._asks.best()
+
+    def top_of_book(self) -> Dict:
+        """Best bid/ask with sizes, mid price and spread (None where a side is empty)."""
+        bid, ask = self._bids.best(), self._asks.best()
+        mid = spread = None
+        if bid and ask:
+            mid = (bid[0] + ask[0]) / 2
+            spread = ask[0] - bid[0]
+        return {
+            "bid": bid[0] if bid else None,
+            "bid_size": bid[1] if bid else 0.0,
+            "ask": ask[0] if ask else None,
+            "ask_size": ask[1] if ask else 0.0,
+            "mid": mid,
+            "spread": spread,
+        }
+
+    def depth_at(self, side: str, price: float) -> float:
+        """Size resting at exactly `price` on `side`."""
+        return self._side(side).size_at(price)
+
+    def depth(self, side: str, levels: Optional[int] = None) -> List[Tuple[float, float]]:
+        """Best `levels` (price, size) pairs on `side`, best first."""
+        return self._side(side).levels(levels)
+
+    def vwap(self, side: str, size: float) -> Optional[float]:
+        """
+        Average price to fill `size` against the levels on `side`.
+
+        Use ASK to price a buy and BID to price a sell. Returns None if the
+        book is too thin to fill the whole size.
+        """
+        if size <= 0:
+            raise ValueError("VWAP size must be positive")
+        book_side = self._side(side)
+        remaining, notional = size, 0.0
+        for key, level_size in zip(book_side.keys, book_side.sizes):
+            take = min(remaining, level_size)
+            notional += take * book_side.sign * key
+            remaining -= take
+            if remaining <= 0:
+                return notional / size
+        return None
+
+    def checkpoint(self) -> Dict:
+        """Serialize the book to a plain dict (ready for YAML/JSON)."""
+        return {
+            "symbol": self.symbol,
+            "sequence": self.sequence,
+            "bids": [list(level) for level in self._bids.levels()],
+            "asks": [list(level) for level in self._asks.levels()],
+        }
+
+    @classmethod
+    def restore(cls, snapshot: Dict) -> "OrderBook":
+        """Rebuild a book from `checkpoint()` output."""
+        book = cls(snapshot["symbol"])
+        book.apply_snapshot(
+            [tuple(level) for level in snapshot["bids"]],
+            [tuple(level) for level in snapshot["asks"]],
+            snapshot.get("sequence", 0),
+        )
+        return book
@@ -1,19 +1,313 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("KQI Order Manager")
+
+OPEN_STATUSES = {"pending", "open", "partial"}
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` requests per second with bursts of `burst`.
+    """
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SimulatedVenue:
+    """
+    In-memory venue for tests and dry runs; every order fills on the first status query.
+
+    Real venue clients implement the same three batched coroutines.
+    """
+    def __init__(self):
+        self.orders: Dict[str, Dict] = {}
+        self.calls = {"submit": 0, "cancel": 0, "status": 0}
+
+    async def submit_orders(self, orders: List[Dict]) -> List[str]:
+        self.calls["submit"] += 1
+        venue_ids = []
+        for order in orders:
+            venue_id = uuid.uuid4().hex
+            self.orders[venue_id] = {"status": "open", "order": order}
+            venue_ids.append(venue_id)
+        return venue_ids
+
+    async def cancel_orders(self, venue_ids: List[str]) -> List[bool]:
+        self.calls["cancel"] += 1
+        results = []
+        for venue_id in venue_ids:
+            entry = self.orders.get(venue_id)
+            cancellable = entry is not None and entry["status"] == "open"
+            if cancellable:
+                entry["status"] = "cancelled"
+            results.append(cancellable)
+        return results
+
+    async def get_order_statuses(self, venue_ids: List[str]) -> Dict[str, Dict]:
+        self.calls["status"] += 1
+        statuses = {}
+        for venue_id in venue_ids:
+            entry = self.orders[venue_id]
+            if entry["status"] == "open":
+                entry["status"] = "filled"
+            filled = entry["status"] == "filled"
+            statuses[venue_id] = {
+                "status": entry["status"],
+                "filled_quantity": entry["order"]["quantity"] if filled else 0.0,
+                "average_price": entry["order"].get("price") if filled else None,
+            }
+        return statuses
+
+
 class OrderManager:
     """
     Handles order lifecycles—submitting, amending, cancelling,
     and reconciling fills—on multiple DeFi protocols.
+
+    Orders are routed to one venue client per protocol behind a per-venue
+    rate limit and tracked in an in-memory index by order ID and client ID.
+    Status is never polled per order: a reconciliation pass sends one
+    batched status query per venue for all of its open orders and emits
+    fill events to registered listeners.
     """
     def __init__(self, api_keys: Dict[str, str]):
-        pass
+        self.api_keys = dict(api_keys)
+        self.orders: Dict[str, Dict] = {}
+        self._by_client_id: Dict[str, str] = {}
+        self._open: Dict[str, Dict[str, str]] = {}  # protocol -> venue order ID -> order ID
+        self._venues: Dict[str, object] = {}
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._batch_sizes: Dict[str, int] = {}
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._reconciler: Optional[asyncio.Task] = None
+
+    def register_venue(self, protocol: str, client, rate_limit: float = 10.0, max_batch_size: int = 100):
+        """
+        Route `protocol` orders to `client`.
+
+        `client` provides async `submit_orders(orders)`, `cancel_orders(venue_ids)`
+        and `get_order_statuses(venue_ids)`; `rate_limit` caps its requests per second.
+        """
+        self._venues[protocol] = client
+        self._limiters[protocol] = RateLimiter(rate_limit)
+        self._batch_sizes[protocol] = max_batch_size
+        self._open.setdefault(protocol, {})
 
-    def submit_order(self, protocol: str, order: Dict) -> str:
+    def add_fill_listener(self, listener: Callable[[Dict], None]):
+        """Call `listener(fill)` for every fill found during reconciliation."""
+        self._listeners.append(listener)
+
+    async def submit_order(self, protocol: str, order: Dict) -> str:
         """Submit an order dict and return an order ID."""
-        pass
+        return (await self.submit_orders([{**order, "protocol": protocol}]))[0]
+
+    async def submit_orders(self, orders: Sequence[Dict]) -> List[str]:
+        """
+        Submit a batch of orders, each carrying its `protocol`.
+
+        Orders are grouped per venue and sent in rate-limited batches; the
+        returned order IDs follow the input order.
+        """
+        # Validate the whole batch before indexing any of it
+        order_ids = [uuid.uuid4().hex for _ in orders]
+        client_ids = []
+        for order, order_id in zip(orders, order_ids):
+            protocol = order["protocol"]
+            if protocol not in self._venues:
+                raise KeyError(f"No venue registered for protocol: {protocol}")
+            client_id = order.get("client_id") or order_id
+            if client_id in self._by_client_id or client_id in client_ids:
+                raise ValueError(f"Duplicate client ID: {client_id}")
+            client_ids.append(client_id)
+
+        by_protocol: Dict[str, List[Dict]] = {}
+        for order, order_id, client_id in zip(orders, order_ids, client_ids):
+            entry = {
+                **order,
+                "order_id": order_id,
+                "client_id": client_id,
+                "status": "pending",
+                "filled_quantity": 0.0,
+                "average_price": None,
+                "venue_order_id": None,
+            }
+            self.orders[order_id] = entry
+            self._by_client_id[client_id] = order_id
+            by_protocol.setdefault(entry["protocol"], []).append(entry)
+
+        await asyncio.gather(*(
+            self._submit_to_venue(protocol, entries) for protocol, entries in by_protocol.items()
+        ))
+        return order_ids
 
-    def cancel_order(self, protocol: str, order_id: str) -> bool:
+    async def _submit_to_venue(self, protocol: str, entries: List[Dict]):
+        venue = self._venues[protocol]
+        for batch in self._batches(protocol, entries):
+            await self._limiters[protocol].acquire()
+            try:
+                venue_ids = await venue.submit_orders([self._venue_payload(e) for e in batch])
+            except Exception as e:
+                logger.error(f"Order submission to {protocol} failed: {e}")
+                for entry in batch:
+                    entry["status"] = "rejected"
+                continue
+            for entry, venue_id in zip(batch, venue_ids):
+                entry["venue_order_id"] = venue_id
+                entry["status"] = "open"
+                self._open[protocol][venue_id] = entry["order_id"]
+
+    @staticmethod
+    def _venue_payload(entry: Dict) -> Dict:
+        internal = {"order_id", "status", "filled_quantity", "average_price", "venue_order_id"}
+        return {k: v for k, v in entry.items() if k not in internal}
+
+    async def cancel_order(self, protocol: str, order_id: str) -> bool:
         """Attempt to cancel an open order; return success flag."""
-        pass
+        return (await self.cancel_orders(protocol, [order_id]))[0]
+
+    async def cancel_orders(self, protocol: str, order_ids: Sequence[str]) -> List[bool]:
+        """
+        Cancel many open orders on one venue with batched requests.
 
-    def get_order_status(self, protocol: str, order_id: str) -> Dict:
+        Cancelled orders stay in the reconciliation set until the venue
+        reports them closed, so fills that landed before the cancel still
+        reach the fill listeners. Orders on another protocol are not
+        cancelled.
+        """
+        if protocol not in self._venues:
+            raise KeyError(f"No venue registered for protocol: {protocol}")
+        entries = [self.orders.get(order_id) for order_id in order_ids]
+        cancellable = [
+            e for e in entries
+            if e is not None and e["protocol"] == protocol and e["venue_order_id"] and e["status"] in OPEN_STATUSES
+        ]
+        cancelled = set()
+        for batch in self._batches(protocol, cancellable):
+            await self._limiters[protocol].acquire()
+            results = await self._venues[protocol].cancel_orders([e["venue_order_id"] for e in batch])
+            for entry, ok in zip(batch, results):
+                if ok:
+                    entry["status"] = "cancelled"
+                    cancelled.add(entry["order_id"])
+        return [order_id in cancelled for order_id in order_ids]
+
+    async def get_order_status(self, protocol: str, order_id: str) -> Dict:
         """Fetch current status (filled, partial, open)."""
-        pass
+        entry = self.orders.get(order_id)
+        if entry is None or entry["protocol"] != protocol:
+            raise KeyError(f"Unknown order {order_id} on {protocol}")
+        return {k: entry[k] for k in ("order_id", "client_id", "status", "filled_quantity", "average_price")}
+
+    def get_by_client_id(self, client_id: str) -> Optional[Dict]:
+        """Look up an order by the caller's client ID."""
+        order_id = self._by_client_id.get(client_id)
+        return self.orders.get(order_id) if order_id else None
+
+    async def reconcile(self) -> List[Dict]:
+        """
+        Refresh every open order with one batched status query per venue.
+
+        Returns the fills found in this pass.
+        """
+        results = await asyncio.gather(*(
+            self._reconcile_venue(protocol) for protocol, open_orders in self._open.items() if open_orders
+        ))
+        fills = [fill for venue_fills in results for fill in venue_fills]
+        for fill in fills:
+            for listener in self._listeners:
+                listener(fill)
+        return fills
+
+    async def _reconcile_venue(self, protocol: str) -> List[Dict]:
+        fills = []
+        venue_ids = list(self._open[protocol])
+        for batch in self._batches(protocol, venue_ids):
+            await self._limiters[protocol].acquire()
+            try:
+                statuses = await self._venues[protocol].get_order_statuses(batch)
+            except Exception as e:
+                logger.warning(f"Status query to {protocol} failed: {e}")
+                continue
+            for venue_id, status in statuses.items():
+                order_id = self._open[protocol].get(venue_id)
+                if order_id is None:
+                    continue
+                entry = self.orders[order_id]
+                fill = self._apply_status(entry, status)
+                if fill is not None:
+                    fills.append(fill)
+                # Cancelled orders are dropped once the venue confirms they are closed
+                if status.get("status", entry["status"]) not in OPEN_STATUSES:
+                    del self._open[protocol][venue_id]
+        return fills
+
+    @staticmethod
+    def _apply_status(entry: Dict, status: Dict) -> Optional[Dict]:
+        previous_qty = entry["filled_quantity"]
+        previous_notional = previous_qty * (entry["average_price"] or 0.0)
+        reported = status.get("status", entry["status"])
+        if not (entry["status"] == "cancelled" and reported in OPEN_STATUSES):
+            entry["status"] = reported
+        filled_qty = status.get("filled_quantity", previous_qty) or 0.0
+        average_price = status.get("average_price")
+        entry["filled_quantity"] = filled_qty
+        if average_price is not None:
+            entry["average_price"] = average_price
+
+        new_qty = filled_qty - previous_qty
+        if new_qty <= 0 or average_price is None:
+            return None
+        # Price of just the newly filled slice, derived from the running average
+        fill_price = (filled_qty * average_price - previous_notional) / new_qty
+        return {
+            "order_id": entry["order_id"],
+            "client_id": entry["client_id"],
+            "protocol": entry["protocol"],
+            "asset": entry.get("asset"),
+            "side": entry.get("side"),
+            "quantity": new_qty,
+            "price": fill_price,
+            "strategy": entry.get("strategy"),
+        }
+
+    def start_reconciliation(self, interval: float = 1.0):
+        """Run `reconcile()` every `interval` seconds on the current event loop."""
+        if self._reconciler is None or self._reconciler.done():
+            self._reconciler = asyncio.ensure_future(self._reconcile_loop(interval))
+
+    async def stop_reconciliation(self):
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            await asyncio.gather(self._reconciler, return_exceptions=True)
+            self._reconciler = None
+
+    async def _reconcile_loop(self, interval: float):
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Reconciliation pass failed: {e}")
+            await asyncio.sleep(interval)
+
+    def _batches(self, protocol: str, items: List) -> List[List]:
+        size = self._batch_sizes.get(protocol, 100)
+        return [items[i:i + size] for i in range(0, len(items), size)]
@@ -1,19 +1,274 @@
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Union
+
+import numpy as np
+
+from core.config_cache import load_yaml_config
+
+DEFAULT_HYPERPARAMETERS = Path(__file__).resolve().parent.parent / "models" / "default_Hyperparameters.yaml"
+
+# Running totals are re-summed from the positions after this many updates
+RESUM_INTERVAL = 10_000
+
+
+@dataclass
+class AssetPosition:
+    """
+    Running state for one asset, using average-cost accounting.
+    """
+    asset: str
+    quantity: float = 0.0
+    average_cost: float = 0.0
+    realized_pnl: float = 0.0
+    fees: float = 0.0
+    last_price: Optional[float] = None
+    strategies: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def exposure(self) -> float:
+        return self.quantity * self.last_price if self.last_price is not None else 0.0
+
+    @property
+    def unrealized_pnl(self) -> float:
+        if self.last_price is None:
+            return 0.0
+        return (self.last_price - self.average_cost) * self.quantity
+
+    def to_dict(self) -> Dict:
+        return {
+            "quantity": self.quantity,
+            "average_cost": self.average_cost,
+            "last_price": self.last_price,
+            "exposure": self.exposure,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "fees": self.fees,
+            "strategies": dict(self.strategies),
+        }
+
+
 class PortfolioManager:
     """
     Maintains an up-to-date book of positions across strategies and protocols,
     computes total exposure, and can suggest rebalances.
+
+    Fill and price events update only the touched asset: its old contribution
+    is taken out of the running totals and its new one added back, so
+    aggregate exposure and PnL are O(1) per event and can be read on every tick.
+    The totals are re-summed exactly every RESUM_INTERVAL updates and whenever
+    a fill closes a position, so floating-point drift cannot build up.
     """
-    def __init__(self):
-        pass
+    def __init__(self, hyperparameters_path: Union[str, Path] = DEFAULT_HYPERPARAMETERS):
+        self.hyperparameters_path = Path(hyperparameters_path)
+        self.positions: Dict[str, AssetPosition] = {}
+        self.gross_exposure = 0.0
+        self.net_exposure = 0.0
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self._updates = 0
 
     def update_positions(self, fills: List[Dict]):
         """Ingest fills/trades and update current holdings."""
-        pass
+        for fill in fills:
+            self.apply_fill(fill)
+
+    def apply_fill(self, fill: Dict):
+        """
+        Apply one fill event.
+
+        A fill has `asset`, `quantity` and `price`, plus an optional `side`
+        ("buy"/"sell"; otherwise the sign of `quantity` is used), `fee` and
+        `strategy`. This is the shape OrderManager emits to fill listeners.
+        """
+        quantity = float(fill["quantity"])
+        if fill.get("side") == "sell":
+            quantity = -abs(quantity)
+        elif fill.get("side") == "buy":
+            quantity = abs(quantity)
+        price = float(fill["price"])
+        fee = float(fill.get("fee") or 0.0)
+
+        position = self._position(fill["asset"])
+        self._remove_contribution(position)
+
+        held = position.quantity
+        if quantity == 0:
+            # Nothing traded; only the fee, if any, applies
+            new_quantity = held
+        elif held == 0 or (held > 0) == (quantity > 0):
+            # Opening or adding: blend the entry price
+            new_quantity = held + quantity
+            position.average_cost = (held * position.average_cost + quantity * price) / new_quantity
+        else:
+            # Reducing, possibly through zero into the opposite side
+            closed = min(abs(quantity), abs(held))
+            realized = closed * (price - position.average_cost) * (1 if held > 0 else -1)
+            position.realized_pnl += realized
+            self.realized_pnl += realized
+            new_quantity = held + quantity
+            if new_quantity == 0:
+                position.average_cost = 0.0
+            elif (new_quantity > 0) != (held > 0):
+                position.average_cost = price
+        position.quantity = new_quantity
+        position.fees += fee
+        position.realized_pnl -= fee
+        self.realized_pnl -= fee
+        if position.last_price is None:
+            position.last_price = price
+
+        strategy = fill.get("strategy")
+        if strategy is not None:
+            position.strategies[strategy] = position.strategies.get(strategy, 0.0) + quantity
+
+        self._add_contribution(position)
+        if new_quantity == 0 and held != 0:
+            self._resum()
+
+    def update_price(self, asset: str, price: float):
+        """Mark one asset to a new price."""
+        position = self._position(asset)
+        self._remove_contribution(position)
+        position.last_price = float(price)
+        self._add_contribution(position)
+
+    def on_tick(self, tick: Dict):
+        """Mark to market from a market data tick (`symbol`, `price`)."""
+        self.update_price(tick["symbol"], tick["price"])
 
     def compute_exposure(self) -> Dict:
         """Return per-asset and aggregate exposure metrics."""
-        pass
+        return {
+            "assets": {asset: position.to_dict() for asset, position in self.positions.items()},
+            "gross_exposure": self.gross_exposure,
+            "net_exposure": self.net_exposure,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+        }
+
+    def rebalance(
+        self,
+        target_allocations: Mapping[str, Union[float, Mapping[str, float]]],
+        prices: Optional[Mapping[str, float]] = None,
+        cash: float = 0.0,
+        min_trade_value: float = 0.0,
+        lot_sizes: Optional[Mapping[str, float]] = None,
+        fee_rate: float = 0.001,
+        slippage: Optional[float] = None,
+    ) -> Dict:
+        """
+        Generate orders necessary to move from current to target weights.
+
+        `target_allocations` maps asset -> weight of equity, or strategy ->
+        {asset: weight} to net several strategies' targets into one order
+        per asset. Held assets without a target are closed. Prices default
+        to each position's last mark; trades are rounded toward zero to
+        `lot_sizes` and dropped below `min_trade_value`. Cost is notional
+        times `fee_rate` plus `slippage`, which defaults to
+        `trade_model.slippage_tolerance` from the hyperparameters file.
+
+        Returns the orders plus the plan's turnover (traded notional over
+        equity), estimated cost and the notional saved by netting.
+        """
+        if slippage is None:
+            slippage = self._slippage_tolerance()
+        per_strategy = any(isinstance(w, Mapping) for w in target_allocations.values())
+        strategy_targets = target_allocations if per_strategy else {None: target_allocations}
+
+        assets = list(dict.fromkeys(
+            [a for a, p in self.positions.items() if p.quantity != 0]
+            + [a for targets in strategy_targets.values() for a in targets]
+        ))
+        index = {asset: i for i, asset in enumerate(assets)}
+        strategies = list(strategy_targets)
+
+        price = np.array([self._price(asset, prices) for asset in assets], dtype=float)
+        held = np.array([self.positions[a].quantity if a in self.positions else 0.0 for a in assets])
+        weights = np.zeros((len(strategies), len(assets)))
+        for row, strategy in enumerate(strategies):
+            for asset, weight in strategy_targets[strategy].items():
+                weights[row, index[asset]] = weight
+        lots = np.array([(lot_sizes or {}).get(a, 0.0) for a in assets], dtype=float)
+
+        equity = float(held @ price) + cash
+        target = weights.sum(axis=0) * equity / price
+        delta = target - held
+        delta = np.where(lots > 0, np.trunc(delta / np.where(lots > 0, lots, 1.0)) * lots, delta)
+        notional = np.abs(delta) * price
+        delta[notional < max(min_trade_value, 1e-12)] = 0.0
+        notional = np.abs(delta) * price
+        cost = notional * (fee_rate + slippage)
+
+        # Notional each strategy would trade on its own, against its own holdings
+        if per_strategy:
+            strategy_held = np.array([
+                [self.positions[a].strategies.get(s, 0.0) if a in self.positions else 0.0 for a in assets]
+                for s in strategies
+            ])
+            unassigned = held - strategy_held.sum(axis=0)
+            standalone = np.abs(weights * equity / price - strategy_held) * price
+            gross_notional = float(standalone.sum() + (np.abs(unassigned) * price).sum())
+        else:
+            gross_notional = float(notional.sum())
+
+        orders = [
+            {
+                "asset": assets[i],
+                "side": "buy" if delta[i] > 0 else "sell",
+                "quantity": float(abs(delta[i])),
+                "price": float(price[i]),
+                "notional": float(notional[i]),
+                "estimated_cost": float(cost[i]),
+            }
+            for i in np.flatnonzero(delta)
+        ]
+        traded = float(notional.sum())
+        return {
+            "orders": orders,
+            "equity": equity,
+            "turnover": traded / equity if equity else 0.0,
+            "estimated_cost": float(cost.sum()),
+            "netting_savings": max(gross_notional - traded, 0.0),
+        }
+
+    def _price(self, asset: str, prices: Optional[Mapping[str, float]]) -> float:
+        if prices is not None and asset in prices:
+            return prices[asset]
+        position = self.positions.get(asset)
+        if position is None or position.last_price is None:
+            raise ValueError(f"No price available for {asset}")
+        return position.last_price
+
+    def _slippage_tolerance(self) -> float:
+        hyperparameters = load_yaml_config(self.hyperparameters_path)
+        return float(hyperparameters["trade_model"]["slippage_tolerance"])
+
+    def _position(self, asset: str) -> AssetPosition:
+        position = self.positions.get(asset)
+        if position is None:
+            position = self.positions[asset] = AssetPosition(asset)
+        return position
+
+    def _remove_contribution(self, position: AssetPosition):
+        exposure = position.exposure
+        self.gross_exposure -= abs(exposure)
+        self.net_exposure -= exposure
+        self.unrealized_pnl -= position.unrealized_pnl
+
+    def _add_contribution(self, position: AssetPosition):
+        exposure = position.exposure
+        self.gross_exposure += abs(exposure)
+        self.net_exposure += exposure
+        self.unrealized_pnl += position.unrealized_pnl
+        self._updates += 1
+        if self._updates % RESUM_INTERVAL == 0:
+            self._resum()
 
-    def rebalance(self, target_allocations: Dict[str, float]):
-        """Generate orders necessary to move from current to target weights."""
-        pass
+    def _resum(self):
+        """Recompute the running totals exactly from the positions."""
+        positions = self.positions.values()
+        self.gross_exposure = math.fsum(abs(p.exposure) for p in positions)
+        self.net_exposure = math.fsum(p.exposure for p in positions)
+        self.unrealized_pnl = math.fsum(p.unrealized_pnl for p in positions)
@@ -0,0 +1,153 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Tuple, Union
+from urllib.parse import quote
+
+import numpy as np
+
+# Fixed-width tick record; timestamps are UTC nanoseconds since the epoch
+TICK_DTYPE = np.dtype(
+    [("timestamp", "<i8"), ("price", "<f8"), ("size", "<f8"), ("side", "i1")],
+    align=True,
+)
+
+# One sparse index entry (first timestamp) per this many records
+INDEX_STRIDE = 4096
+
+
+def to_nanos(value: Union[datetime, np.datetime64, int]) -> int:
+    """Convert a datetime (naive = UTC) or datetime64 to epoch nanoseconds."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(np.datetime64(value, "ns").astype(np.int64))
+
+
+class TickStore:
+    """
+    Append-only, memory-mapped tick storage.
+
+    Each symbol has a `<symbol>.ticks` file of fixed-width TICK_DTYPE records
+    in time order and a `<symbol>.idx` sparse index holding the timestamp of
+    every INDEX_STRIDE-th record. Range reads binary-search the small index,
+    then one stride of the data file, and return a NumPy view onto the
+    memory map, so nothing is copied and datasets larger than RAM can be
+    scanned page by page.
+    """
+    def __init__(self, root: str = "./data/ticks"):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._maps: Dict[str, Tuple[int, np.memmap]] = {}
+        self._indexes: Dict[str, Tuple[int, np.ndarray]] = {}
+
+    def append(self, symbol: str, ticks: np.ndarray):
+        """
+        Append ticks to a symbol's file.
+
+        Ticks must be TICK_DTYPE records sorted by timestamp and not older
+        than the last stored tick.
+        """
+        ticks = np.ascontiguousarray(ticks, dtype=TICK_DTYPE)
+        if len(ticks) == 0:
+            return
+        if np.any(np.diff(ticks["timestamp"]) < 0):
+            raise ValueError("Ticks must be sorted by timestamp")
+
+        count = self.count(symbol)
+        if count and ticks["timestamp"][0] < self._last_timestamp(symbol):
+            raise ValueError("Ticks must not be older than the last stored tick")
+
+        with open(self._data_path(symbol), "ab") as f:
+            f.write(ticks.tobytes())
+
+        # Index the records landing on stride boundaries
+        first_new = -(-count // INDEX_STRIDE) * INDEX_STRIDE
+        positions = np.arange(first_new, count + len(ticks), INDEX_STRIDE) - count
+        if len(positions):
+            with open(self._index_path(symbol), "ab") as f:
+                f.write(ticks["timestamp"][positions].astype("<i8").tobytes())
+
+    def count(self, symbol: str) -> int:
+        """Return the number of stored ticks for a symbol."""
+        path = self._data_path(symbol)
+        return path.stat().st_size // TICK_DTYPE.itemsize if path.exists() else 0
+
+    def read(self, symbol: str, start: Union[datetime, int], end: Union[datetime, int]) -> np.ndarray:
+        """
+        Return ticks with `start <= timestamp < end` as a zero-copy view.
+
+        The view stays valid while the store is alive; copy it before
+        mutating or keeping it past a later append.
+        """
+        ticks = self._map(symbol)
+        lo, hi = self._bounds(symbol, ticks, to_nanos(start), to_nanos(end))
+        return ticks[lo:hi]
+
+    def iter_chunks(
+        self,
+        symbol: str,
+        start: Union[datetime, int],
+        end: Union[datetime, int],
+        window: timedelta,
+    ) -> Iterator[np.ndarray]:
+        """Yield zero-copy views of consecutive `window`-long time slices."""
+        step = int(window.total_seconds() * 1e9)
+        if step <= 0:
+            raise ValueError("window must be positive")
+        ticks = self._map(symbol)
+        start_ns, end_ns = to_nanos(start), to_nanos(end)
+        lo, _ = self._bounds(symbol, ticks, start_ns, start_ns)
+        slice_start = start_ns
+        while slice_start < end_ns:
+            slice_end = min(slice_start + step, end_ns)
+            _, hi = self._bounds(symbol, ticks, slice_end, slice_end)
+            if hi > lo:
+                yield ticks[lo:hi]
+            lo = hi
+            slice_start = slice_end
+
+    def _bounds(self, symbol: str, ticks: np.ndarray, start_ns: int, end_ns: int) -> Tuple[int, int]:
+        return self._search(symbol, ticks, start_ns), self._search(symbol, ticks, end_ns)
+
+    def _search(self, symbol: str, ticks: np.ndarray, value: int) -> int:
+        """Position of the first tick with timestamp >= value."""
+        index = self._index(symbol)
+        if len(ticks) == 0:
+            return 0
+        # Narrow to one stride with the in-memory index, then search it
+        block = max(int(np.searchsorted(index, value, side="left")) - 1, 0)
+        lo = block * INDEX_STRIDE
+        hi = min(lo + 2 * INDEX_STRIDE, len(ticks))
+        return lo + int(np.searchsorted(ticks["timestamp"][lo:hi], value, side="left"))
+
+    def _map(self, symbol: str) -> np.ndarray:
+        size = self.count(symbol)
+        cached = self._maps.get(symbol)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+        if size == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        ticks = np.memmap(self._data_path(symbol), dtype=TICK_DTYPE, mode="r", shape=(size,))
+        self._maps[symbol] = (size, ticks)
+        return ticks
+
+    def _index(self, symbol: str) -> np.ndarray:
+        path = self._index_path(symbol)
+        size = path.stat().st_size if path.exists() else 0
+        cached = self._indexes.get(symbol)
+        if cached is None or cached[0] != size:
+            index = np.fromfile(path, dtype="<i8") if size else np.empty(0, dtype="<i8")
+            cached = (size, index)
+            self._indexes[symbol] = cached
+        return cached[1]
+
+    def _last_timestamp(self, symbol: str) -> int:
+        with open(self._data_path(symbol), "rb") as f:
+            f.seek(-TICK_DTYPE.itemsize, os.SEEK_END)
+            return int(np.frombuffer(f.read(TICK_DTYPE.itemsize), dtype=TICK_DTYPE)["timestamp"][0])
+
+    def _data_path(self, symbol: str) -> Path:
+        return self.root / f"{quote(symbol, safe='')}.ticks"
+
+    def _index_path(self, symbol: str) -> Path:
+        return self.root / f"{quote(symbol, safe='')}.idx"
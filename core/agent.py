@@ -3,6 +3,8 @@ import logging
 from typing import Dict, Optional
 from pathlib import Path
 
+from core.config_cache import invalidate_config
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("KQI Agent Builder")
@@ -77,6 +79,34 @@ class AgentBuilder:
         logger.info(f"Added protocol: {protocol}")
         return self
 
+    def set_execution_mode(
+        self,
+        mode: str,
+        leg_timeout: float = 30.0,
+    ) -> "AgentBuilder":
+        """
+        Set how the executor runs the agent's protocol legs.
+
+        Per-protocol concurrency is limited process-wide, across all agents,
+        with `core.executor.set_protocol_concurrency`.
+
+        Args:
+            mode (str): "serial" to trade one protocol at a time, or "concurrent"
+                        to fan the legs out on an event loop.
+            leg_timeout (float): Seconds before a single leg is cancelled.
+
+        Returns:
+            AgentBuilder: The builder instance for method chaining.
+        """
+        if mode not in ("serial", "concurrent"):
+            raise ValueError("Execution mode must be 'serial' or 'concurrent'")
+        self.config["agent"]["execution"] = {
+            "mode": mode,
+            "leg_timeout": leg_timeout,
+        }
+        logger.info(f"Execution mode set to: {mode}")
+        return self
+
     def set_api_key(self, api_key: str) -> "AgentBuilder":
         """
         Set the API key for the KQI platform.
@@ -110,6 +140,7 @@ class AgentBuilder:
 
         with open(file_path, "w") as file:
             yaml.dump(self.config, file)
+        invalidate_config(file_path)
         
         logger.info(f"Configuration saved to: {file_path}")
         return file_path
@@ -0,0 +1,131 @@
+import yaml
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple, Union
+from pathlib import Path
+
+try:
+    # libyaml bindings are several times faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+logger = logging.getLogger("KQI Config Cache")
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert parsed YAML into a read-only view.
+
+    Dicts become `MappingProxyType` and lists become tuples, so a cached
+    configuration can be handed to many readers without defensive copies.
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Recursively convert a frozen view back into plain, mutable dicts and lists.
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def parse_yaml(path: Union[str, Path]) -> Any:
+    """
+    Parse a YAML file with the fastest available safe loader.
+    """
+    with open(path, "r") as file:
+        return yaml.load(file, Loader=SafeLoader)
+
+
+class ConfigCache:
+    """
+    Process-wide cache of parsed configuration files.
+
+    Entries are keyed by the resolved path and a "kind" (e.g. raw YAML or a
+    validation schema), and are invalidated whenever the file's modification
+    time or size changes. A cache hit costs a single `stat` call.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Hashable], Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Union[str, Path], kind: Hashable, loader: Callable[[Path], Any]) -> Any:
+        """
+        Return the cached value for `path`, calling `loader` if it is missing or stale.
+
+        Args:
+            path (Union[str, Path]): Path to the configuration file.
+            kind (Hashable): Distinguishes several parsed forms of the same file.
+            loader (Callable[[Path], Any]): Parses the file into the value to cache.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        path = Path(path)
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = (str(path.resolve()), kind)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+
+        value = loader(path)
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self.misses += 1
+        return value
+
+    def load_yaml(self, path: Union[str, Path]) -> Any:
+        """
+        Return a frozen view of a YAML file's contents.
+        """
+        return self.get(path, "yaml", lambda p: freeze(parse_yaml(p)))
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Drop every cached form of `path`, or the whole cache if no path is given.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            resolved = str(Path(path).resolve())
+            for key in [key for key in self._entries if key[0] == resolved]:
+                del self._entries[key]
+
+
+# Shared by the executor, optimizer, builder and training config loaders
+config_cache = ConfigCache()
+
+
+def load_yaml_config(path: Union[str, Path]) -> Any:
+    """
+    Load a YAML configuration through the shared cache.
+
+    Returns:
+        Any: A read-only view of the parsed file. Use `thaw()` for a mutable copy.
+    """
+    return config_cache.load_yaml(path)
+
+
+def invalidate_config(path: Optional[Union[str, Path]] = None) -> None:
+    """
+    Invalidate a configuration file in the shared cache after writing it.
+    """
+    config_cache.invalidate(path)
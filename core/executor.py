@@ -1,12 +1,69 @@
 import yaml
+import asyncio
 import logging
-from typing import Dict
+import weakref
+from typing import Dict, List, Mapping, Optional
 from pathlib import Path
 
+from core.config_cache import load_yaml_config
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("KQI Agent Executor")
 
+# Concurrent trade legs allowed per protocol across every agent in the
+# process. This is a process-level setting, not a per-agent one: all agents
+# trading a protocol share one limit, set with `set_protocol_concurrency`.
+_protocol_limits: Dict[Optional[str], int] = {None: 1}  # None holds the default
+
+# Semaphores are bound to an event loop, hence one set per loop
+_protocol_semaphores = weakref.WeakKeyDictionary()  # event loop -> protocol -> (limit, Semaphore)
+
+
+def set_protocol_concurrency(limit: int, protocol: Optional[str] = None) -> None:
+    """
+    Set the process-wide limit on concurrent trade legs for a protocol.
+
+    Args:
+        limit (int): Maximum in-flight legs across all agents.
+        protocol (Optional[str]): The protocol to limit; None sets the default
+                                  for protocols without their own limit.
+    """
+    if limit < 1:
+        raise ValueError("Protocol concurrency limit must be at least 1")
+    _protocol_limits[protocol] = limit
+    logger.info(f"Concurrency limit for {protocol or 'protocols without their own limit'} set to {limit}")
+
+
+def get_protocol_concurrency(protocol: str) -> int:
+    """
+    Return the process-wide concurrency limit for a protocol.
+    """
+    return _protocol_limits.get(protocol, _protocol_limits[None])
+
+
+def _protocol_semaphore(protocol: str) -> asyncio.Semaphore:
+    """
+    Return the running loop's semaphore for a protocol.
+
+    A semaphore is replaced when its protocol's limit has changed; legs
+    already holding the old one finish under the old limit.
+
+    Args:
+        protocol (str): The protocol the semaphore guards.
+
+    Returns:
+        asyncio.Semaphore: The shared semaphore for `protocol`.
+    """
+    limit = get_protocol_concurrency(protocol)
+    semaphores = _protocol_semaphores.setdefault(asyncio.get_running_loop(), {})
+    entry = semaphores.get(protocol)
+    if entry is None or entry[0] != limit:
+        entry = (limit, asyncio.Semaphore(limit))
+        semaphores[protocol] = entry
+    return entry[1]
+
+
 class AgentExecutor:
     """
     A class to execute and manage KQI agents based on their configuration.
@@ -20,20 +77,20 @@ class AgentExecutor:
             config_path (str): Path to the YAML configuration file.
         """
         self.config_path = config_path
-        self.config: Dict = self._load_config()
+        self.config: Mapping = self._load_config()
 
-    def _load_config(self) -> Dict:
+    def _load_config(self) -> Mapping:
         """
         Load the agent configuration from the YAML file.
 
         Returns:
-            Dict: The loaded configuration.
+            Mapping: A read-only view of the loaded configuration, shared through
+                     the process-wide config cache.
         """
         try:
-            with open(self.config_path, "r") as file:
-                config = yaml.safe_load(file)
-                logger.info(f"Configuration loaded from: {self.config_path}")
-                return config
+            config = load_yaml_config(self.config_path)
+            logger.info(f"Configuration loaded from: {self.config_path}")
+            return config
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {self.config_path}")
             raise
@@ -41,6 +98,12 @@ class AgentExecutor:
             logger.error(f"Error parsing YAML file: {e}")
             raise
 
+    def reload_config(self) -> None:
+        """
+        Refresh the configuration, re-parsing the file only if it changed on disk.
+        """
+        self.config = load_yaml_config(self.config_path)
+
     def validate_config(self) -> bool:
         """
         Validate the agent configuration.
@@ -66,6 +129,40 @@ class AgentExecutor:
     def run(self) -> None:
         """
         Execute the agent's trading strategy.
+
+        Agents configured with `execution.mode: concurrent` fan their protocol
+        legs out on an event loop; all others walk the protocols serially.
+        """
+        strategy, protocols = self._prepare_run()
+
+        if self._execution_settings()["mode"] == "concurrent":
+            asyncio.run(self._execute_strategy_async(strategy, protocols))
+        else:
+            # Simulate strategy execution (replace with actual execution logic)
+            self._execute_strategy(strategy, protocols)
+
+    async def run_async(self) -> None:
+        """
+        Execute the agent's trading strategy on the running event loop.
+
+        Concurrent agents fan their protocol legs out on the loop; serial
+        agents run `_execute_strategy` in the loop's thread pool so they do
+        not block it.
+        """
+        strategy, protocols = self._prepare_run()
+
+        if self._execution_settings()["mode"] == "concurrent":
+            await self._execute_strategy_async(strategy, protocols)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._execute_strategy, strategy, protocols)
+
+    def _prepare_run(self) -> tuple:
+        """
+        Validate the configuration and log the run parameters.
+
+        Returns:
+            tuple: The strategy name and the list of protocols.
         """
         if not self.validate_config():
             raise ValueError("Invalid configuration. Please check the configuration file.")
@@ -74,14 +171,32 @@ class AgentExecutor:
         strategy = self.config["agent"]["strategy"]
         risk_level = self.config["agent"]["risk_level"]
         protocols = self.config["agent"]["protocols"]
-        api_key = self.config["api"]["key"]
 
         logger.info(f"Starting agent '{agent_name}' with strategy '{strategy}'...")
         logger.info(f"Risk level: {risk_level}")
         logger.info(f"Protocols: {', '.join(protocols)}")
+        return strategy, protocols
+
+    def _execution_settings(self) -> Dict:
+        """
+        Read the optional `agent.execution` section of the configuration.
 
-        # Simulate strategy execution (replace with actual execution logic)
-        self._execute_strategy(strategy, protocols)
+        Returns:
+            Dict: The execution mode and leg timeout.
+        """
+        execution = self.config["agent"].get("execution") or {}
+        if "max_concurrency_per_protocol" in execution:
+            raise ValueError(
+                "max_concurrency_per_protocol is a process-wide setting; "
+                "use core.executor.set_protocol_concurrency instead of the agent configuration"
+            )
+        settings = {
+            "mode": execution.get("mode", "serial"),
+            "leg_timeout": execution.get("leg_timeout", 30.0),
+        }
+        if settings["mode"] not in ("serial", "concurrent"):
+            raise ValueError("Execution mode must be 'serial' or 'concurrent'")
+        return settings
 
     def _execute_strategy(self, strategy: str, protocols: list) -> None:
         """
@@ -110,6 +225,77 @@ class AgentExecutor:
         # Replace with actual trade execution logic
         logger.info(f"Trade executed successfully on {protocol}.")
 
+    async def _execute_strategy_async(self, strategy: str, protocols: List[str]) -> None:
+        """
+        Execute a trading strategy with one concurrent trade leg per protocol.
+
+        Each leg waits on its protocol's semaphore and is bounded by the leg
+        timeout. If any leg fails or times out, its sibling legs are cancelled
+        and the error is re-raised, so a cycle costs the slowest venue rather
+        than the sum of all of them.
+
+        Args:
+            strategy (str): The name of the strategy.
+            protocols (List[str]): List of protocols the agent interacts with.
+        """
+        logger.info(f"Executing strategy concurrently: {strategy}")
+        settings = self._execution_settings()
+        legs = [
+            asyncio.ensure_future(self._run_leg(protocol, settings))
+            for protocol in protocols
+        ]
+        if not legs:
+            logger.info("Strategy execution completed.")
+            return
+
+        done, pending = await asyncio.wait(legs, return_when=asyncio.FIRST_EXCEPTION)
+        failed = [leg for leg in done if not leg.cancelled() and leg.exception() is not None]
+        if failed:
+            for leg in pending:
+                leg.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.error(f"Cancelled {len(pending)} sibling leg(s) after a failed trade leg.")
+            raise failed[0].exception()
+
+        logger.info("Strategy execution completed.")
+
+    async def _run_leg(self, protocol: str, settings: Dict) -> None:
+        """
+        Run a single trade leg under its protocol's concurrency limit and timeout.
+
+        The limit is process-wide and shared with every other agent trading
+        the same protocol (see `set_protocol_concurrency`).
+
+        Args:
+            protocol (str): The protocol to interact with.
+            settings (Dict): The execution settings from `_execution_settings`.
+        """
+        semaphore = _protocol_semaphore(protocol)
+
+        async with semaphore:
+            logger.info(f"Interacting with protocol: {protocol}")
+            try:
+                await asyncio.wait_for(
+                    self._simulate_trade_async(protocol),
+                    timeout=settings["leg_timeout"],
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Trade leg on {protocol} timed out after {settings['leg_timeout']}s")
+                raise
+
+    async def _simulate_trade_async(self, protocol: str) -> None:
+        """
+        Simulate a trade on a specific protocol without blocking the event loop.
+
+        The default implementation runs `_simulate_trade` in the loop's thread
+        pool; venue integrations with native async clients should override this.
+
+        Args:
+            protocol (str): The protocol to interact with.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._simulate_trade, protocol)
+
 
 # Example Usage
 if __name__ == "__main__":
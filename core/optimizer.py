@@ -4,6 +4,8 @@ from typing import Dict, List, Optional
 from pathlib import Path
 from datetime import datetime
 
+from core.config_cache import invalidate_config, load_yaml_config, thaw
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("KQI Agent Optimizer")
@@ -31,13 +33,12 @@ class AgentOptimizer:
         Load the agent configuration from the YAML file.
 
         Returns:
-            Dict: The loaded configuration.
+            Dict: A mutable copy of the cached configuration.
         """
         try:
-            with open(self.config_path, "r") as file:
-                config = yaml.safe_load(file)
-                logger.info(f"Configuration loaded from: {self.config_path}")
-                return config
+            config = thaw(load_yaml_config(self.config_path))
+            logger.info(f"Configuration loaded from: {self.config_path}")
+            return config
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {self.config_path}")
             raise
@@ -53,10 +54,9 @@ class AgentOptimizer:
             Dict: The loaded performance data.
         """
         try:
-            with open(self.performance_data_path, "r") as file:
-                performance_data = yaml.safe_load(file)
-                logger.info(f"Performance data loaded from: {self.performance_data_path}")
-                return performance_data or {}
+            performance_data = thaw(load_yaml_config(self.performance_data_path))
+            logger.info(f"Performance data loaded from: {self.performance_data_path}")
+            return performance_data or {}
         except FileNotFoundError:
             logger.warning(f"Performance data file not found: {self.performance_data_path}")
             return {}
@@ -156,6 +156,7 @@ class AgentOptimizer:
         """
         with open(self.config_path, "w") as file:
             yaml.dump(self.config, file)
+        invalidate_config(self.config_path)
 
         logger.info(f"Updated configuration saved to: {self.config_path}")
         return self.config_path
@@ -0,0 +1,218 @@
+import asyncio
+import argparse
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+from pathlib import Path
+
+from core.executor import AgentExecutor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("KQI Agent Supervisor")
+
+
+@dataclass
+class AgentStats:
+    """
+    Per-agent cycle timing and crash counters kept by the supervisor.
+    """
+    config_path: str
+    cycles: int = 0
+    failures: int = 0
+    restarts: int = 0
+    last_cycle_time: float = 0.0
+    max_cycle_time: float = 0.0
+    total_cycle_time: float = 0.0
+    last_error: Optional[str] = None
+
+    @property
+    def mean_cycle_time(self) -> float:
+        return self.total_cycle_time / self.cycles if self.cycles else 0.0
+
+    def record_cycle(self, elapsed: float) -> None:
+        self.cycles += 1
+        self.last_cycle_time = elapsed
+        self.total_cycle_time += elapsed
+        self.max_cycle_time = max(self.max_cycle_time, elapsed)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["mean_cycle_time"] = self.mean_cycle_time
+        return data
+
+
+class AgentSupervisor:
+    """
+    Runs every agent configuration in a directory on one shared event loop.
+    """
+
+    def __init__(
+        self,
+        config_dir: str,
+        cycle_interval: float = 1.0,
+        max_cycles: Optional[int] = None,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_restarts: Optional[int] = None,
+        pattern: str = "*.yaml",
+    ):
+        """
+        Initialize the supervisor.
+
+        Args:
+            config_dir (str): Directory containing agent YAML configuration files.
+            cycle_interval (float): Seconds to wait between two cycles of one agent.
+            max_cycles (Optional[int]): Stop each agent after this many successful cycles.
+                                        Runs until `stop()` is called if not provided.
+            initial_backoff (float): Seconds to wait before the first restart of a crashed agent.
+            max_backoff (float): Upper bound for the doubling restart backoff.
+            max_restarts (Optional[int]): Give up on an agent after this many restarts.
+                                          Restarts indefinitely if not provided.
+            pattern (str): Glob pattern used to discover configuration files.
+        """
+        self.config_dir = Path(config_dir)
+        self.cycle_interval = cycle_interval
+        self.max_cycles = max_cycles
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_restarts = max_restarts
+        self.pattern = pattern
+        self.agents: Dict[str, AgentStats] = {}
+        self._stopping: Optional[asyncio.Event] = None
+
+    def discover(self) -> List[Path]:
+        """
+        List the agent configuration files in the configuration directory.
+
+        Returns:
+            List[Path]: The configuration paths, sorted by name.
+        """
+        if not self.config_dir.is_dir():
+            raise FileNotFoundError(f"Configuration directory not found: {self.config_dir}")
+        return sorted(self.config_dir.glob(self.pattern))
+
+    async def run(self) -> Dict[str, Dict]:
+        """
+        Supervise every discovered agent until they finish or `stop()` is called.
+
+        Returns:
+            Dict[str, Dict]: The final per-agent statistics.
+        """
+        self._stopping = asyncio.Event()
+        config_paths = self.discover()
+        logger.info(f"Supervising {len(config_paths)} agent(s) from {self.config_dir}")
+
+        tasks = [asyncio.ensure_future(self._supervise(path)) for path in config_paths]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info("All agents stopped.")
+        return self.stats()
+
+    def stop(self) -> None:
+        """
+        Ask every agent loop to exit after its current cycle.
+        """
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Return per-agent cycle timing and crash counters.
+
+        Returns:
+            Dict[str, Dict]: Statistics keyed by configuration file stem.
+        """
+        return {name: stats.to_dict() for name, stats in self.agents.items()}
+
+    async def _supervise(self, config_path: Path) -> None:
+        """
+        Run one agent's cycles, rebuilding its executor with backoff after a crash.
+
+        Args:
+            config_path (Path): Path to the agent's configuration file.
+        """
+        stats = self.agents.setdefault(config_path.stem, AgentStats(str(config_path)))
+        executor: Optional[AgentExecutor] = None
+        backoff = self.initial_backoff
+
+        while not self._stopping.is_set():
+            if self.max_cycles is not None and stats.cycles >= self.max_cycles:
+                break
+
+            try:
+                if executor is None:
+                    executor = AgentExecutor(str(config_path))
+                else:
+                    # Cheap when unchanged: the config cache only stats the file
+                    executor.reload_config()
+                start = time.perf_counter()
+                await executor.run_async()
+                stats.record_cycle(time.perf_counter() - start)
+                backoff = self.initial_backoff
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.failures += 1
+                stats.last_error = repr(e)
+                executor = None
+                if self.max_restarts is not None and stats.restarts >= self.max_restarts:
+                    logger.error(f"Agent '{config_path.stem}' crashed: {e}. Giving up after {stats.restarts} restarts")
+                    break
+                logger.error(f"Agent '{config_path.stem}' crashed: {e}. Restarting in {backoff:.1f}s")
+                if await self._sleep(backoff):
+                    break
+                stats.restarts += 1
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            if await self._sleep(self.cycle_interval):
+                break
+
+    async def _sleep(self, delay: float) -> bool:
+        """
+        Sleep for `delay` seconds, waking early if the supervisor is stopping.
+
+        Returns:
+            bool: True if the supervisor is stopping.
+        """
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        return self._stopping.is_set()
+
+
+# Example Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a directory of KQI agents in one process.")
+    parser.add_argument("config_dir", nargs="?", default="./config")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between agent cycles")
+    parser.add_argument("--max-cycles", type=int, default=None, help="Stop each agent after N cycles")
+    parser.add_argument("--max-restarts", type=int, default=None, help="Give up on an agent after N restarts")
+    args = parser.parse_args()
+
+    supervisor = AgentSupervisor(
+        args.config_dir,
+        cycle_interval=args.interval,
+        max_cycles=args.max_cycles,
+        max_restarts=args.max_restarts,
+    )
+    try:
+        final_stats = asyncio.run(supervisor.run())
+    except KeyboardInterrupt:
+        final_stats = supervisor.stats()
+
+    for name, agent_stats in final_stats.items():
+        logger.info(
+            f"{name}: {agent_stats['cycles']} cycles, "
+            f"mean {agent_stats['mean_cycle_time'] * 1000:.1f} ms, "
+            f"max {agent_stats['max_cycle_time'] * 1000:.1f} ms, "
+            f"{agent_stats['restarts']} restarts"
+        )
@@ -1,17 +1,19 @@
-from dataclasses import dataclass, asdict
+import json
+import struct
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Tuple, Union
 
-@dataclass
-class PerformanceModel:
-    """
-    Captures backtest or live‐run performance metrics.
-    """
-    timestamp: datetime
-    total_return: float
-    volatility: float
-    max_drawdown: float
-    metrics: Dict[str, Any]
+# Binary layout: record count, then per model the three core floats, the
+# ISO timestamp and JSON-encoded metrics, each length-prefixed
+_COUNT = struct.Struct("<I")
+_HEADER = struct.Struct("<dddHI")
+
+PerformanceRecord = Tuple[datetime, float, float, float, Dict[str, Any]]
+
+
+class _PerformanceMethods:
+    __slots__ = ()
 
     def summary(self) -> Dict[str, Any]:
         """
@@ -27,16 +29,89 @@ class PerformanceModel:
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dict (ready for YAML/JSON)."""
-        data = asdict(self)
-        data["timestamp"] = self.timestamp.isoformat()
-        return data
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "total_return": self.total_return,
+            "volatility": self.volatility,
+            "max_drawdown": self.max_drawdown,
+            "metrics": dict(self.metrics),
+        }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "PerformanceModel":
+    def from_dict(cls, data: Dict[str, Any]):
         """Reconstruct from serialized dict."""
         ts = datetime.fromisoformat(data["timestamp"])
         # extract core fields
         core = {k: data[k] for k in ("total_return", "volatility", "max_drawdown")}
-        # anything else goes into metrics
-        extra = {k: v for k, v in data.items() if k not in core and k != "timestamp"}
+        # anything else goes into metrics, whether nested (to_dict) or flat (summary)
+        extra = dict(data.get("metrics") or {})
+        extra.update({k: v for k, v in data.items() if k not in core and k not in ("timestamp", "metrics")})
         return cls(timestamp=ts, metrics=extra, **core)
+
+
+@dataclass
+class PerformanceModel(_PerformanceMethods):
+    """
+    Captures backtest or live‐run performance metrics.
+    """
+    timestamp: datetime
+    total_return: float
+    volatility: float
+    max_drawdown: float
+    metrics: Dict[str, Any]
+
+
+@dataclass(slots=True)
+class CompactPerformanceModel(_PerformanceMethods):
+    """
+    Slotted PerformanceModel without a per-instance __dict__.
+    """
+    timestamp: datetime
+    total_return: float
+    volatility: float
+    max_drawdown: float
+    metrics: Dict[str, Any]
+
+
+AnyPerformance = Union[PerformanceModel, CompactPerformanceModel]
+
+
+def to_records(models: Iterable[AnyPerformance]) -> List[PerformanceRecord]:
+    """Convert models to plain field tuples."""
+    return [(m.timestamp, m.total_return, m.volatility, m.max_drawdown, m.metrics) for m in models]
+
+
+def from_records(records: Iterable[PerformanceRecord], compact: bool = True) -> List[AnyPerformance]:
+    """Build models from field tuples."""
+    cls = CompactPerformanceModel if compact else PerformanceModel
+    return [cls(*record) for record in records]
+
+
+def pack_performance(models: Iterable[AnyPerformance]) -> bytes:
+    """Serialize models to a compact binary blob; metrics must be JSON-serializable."""
+    parts = [b""]
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    for timestamp, total_return, volatility, max_drawdown, metrics in to_records(models):
+        stamp = timestamp.isoformat().encode("ascii")
+        payload = encode(metrics).encode("utf-8")
+        parts.append(_HEADER.pack(total_return, volatility, max_drawdown, len(stamp), len(payload)) + stamp + payload)
+    parts[0] = _COUNT.pack(len(parts) - 1)
+    return b"".join(parts)
+
+
+def unpack_performance(data: bytes, compact: bool = True) -> List[AnyPerformance]:
+    """Deserialize models written by `pack_performance`."""
+    view = memoryview(data)
+    (count,) = _COUNT.unpack_from(view, 0)
+    offset = _COUNT.size
+    decode = json.JSONDecoder().decode
+    records = []
+    for _ in range(count):
+        total_return, volatility, max_drawdown, stamp_length, payload_length = _HEADER.unpack_from(view, offset)
+        offset += _HEADER.size
+        timestamp = datetime.fromisoformat(str(view[offset:offset + stamp_length], "ascii"))
+        offset += stamp_length
+        metrics = decode(str(view[offset:offset + payload_length], "utf-8"))
+        offset += payload_length
+        records.append((timestamp, total_return, volatility, max_drawdown, metrics))
+    return from_records(records, compact)
@@ -1,6 +1,9 @@
 from dataclasses import dataclass, field
-from typing import List, Dict
-from .position_model import PositionModel
+from typing import List, Dict, Iterable, Optional
+
+import numpy as np
+
+from models.position_Model import PositionModel
 
 @dataclass
 class PortfolioModel:
@@ -37,3 +40,133 @@ class PortfolioModel:
             else:
                 exp[p.asset] = 0.0
         return exp
+
+
+class ArrayPortfolioModel:
+    """
+    Array-backed portfolio for large books.
+
+    Each asset owns one slot in NumPy columns for quantity, entry price and
+    current price (NaN when unset), found through an asset->slot dict, so
+    lookups and removals are O(1) and PnL/exposure are vectorized.
+    Adding an asset that is already held replaces its slot.
+    """
+    def __init__(self, positions: Optional[Iterable[PositionModel]] = None, capacity: int = 64):
+        self.assets: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._quantity = np.zeros(capacity)
+        self._entry_price = np.zeros(capacity)
+        self._current_price = np.full(capacity, np.nan)
+        for pos in positions or ():
+            self.add_position(pos)
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def __contains__(self, asset: str) -> bool:
+        return asset in self._index
+
+    @property
+    def quantity(self) -> np.ndarray:
+        return self._quantity[:len(self.assets)]
+
+    @property
+    def entry_price(self) -> np.ndarray:
+        return self._entry_price[:len(self.assets)]
+
+    @property
+    def current_price(self) -> np.ndarray:
+        return self._current_price[:len(self.assets)]
+
+    def add_position(self, pos: PositionModel):
+        slot = self._index.get(pos.asset)
+        if slot is None:
+            slot = len(self.assets)
+            if slot == len(self._quantity):
+                self._grow()
+            self.assets.append(pos.asset)
+            self._index[pos.asset] = slot
+        self._quantity[slot] = pos.quantity
+        self._entry_price[slot] = pos.entry_price
+        self._current_price[slot] = np.nan if pos.current_price is None else pos.current_price
+
+    def remove_position(self, asset: str):
+        slot = self._index.pop(asset, None)
+        if slot is None:
+            return
+        # Move the last slot into the hole so the columns stay dense
+        last = len(self.assets) - 1
+        if slot != last:
+            moved = self.assets[last]
+            self.assets[slot] = moved
+            self._index[moved] = slot
+            for column in (self._quantity, self._entry_price, self._current_price):
+                column[slot] = column[last]
+        self.assets.pop()
+        self._current_price[last] = np.nan
+
+    def update_price(self, asset: str, new_price: float):
+        slot = self._index.get(asset)
+        if slot is not None:
+            self._current_price[slot] = new_price
+
+    def update_prices(self, prices: Dict[str, float]):
+        """
+        Reprice many assets at once; assets not in the portfolio are ignored.
+        """
+        pairs = [(self._index[a], p) for a, p in prices.items() if a in self._index]
+        if pairs:
+            slots, values = zip(*pairs)
+            self._current_price[list(slots)] = values
+
+    def get_position(self, asset: str) -> PositionModel:
+        slot = self._index[asset]
+        price = self._current_price[slot]
+        return PositionModel(
+            asset=asset,
+            quantity=float(self._quantity[slot]),
+            entry_price=float(self._entry_price[slot]),
+            current_price=None if np.isnan(price) else float(price),
+        )
+
+    @property
+    def positions(self) -> List[PositionModel]:
+        return [self.get_position(asset) for asset in self.assets]
+
+    def pnl_array(self) -> np.ndarray:
+        """Per-slot PnL, 0 where no current price is set."""
+        pnl = (self.current_price - self.entry_price) * self.quantity
+        return np.nan_to_num(pnl, nan=0.0)
+
+    def exposure_array(self) -> np.ndarray:
+        """Per-slot exposure, 0 where no current price is set."""
+        return np.nan_to_num(self.quantity * self.current_price, nan=0.0)
+
+    def total_pnl(self) -> float:
+        """
+        Sum of PnL across all positions (ignores positions with no current price).
+        """
+        return float(self.pnl_array().sum())
+
+    def exposure(self) -> Dict[str, float]:
+        """
+        Returns raw exposure per asset (quantity * current_price), 0 if no price.
+        """
+        return dict(zip(self.assets, self.exposure_array().tolist()))
+
+    @classmethod
+    def from_portfolio(cls, portfolio: PortfolioModel) -> "ArrayPortfolioModel":
+        return cls(portfolio.positions, capacity=max(64, len(portfolio.positions)))
+
+    def to_portfolio(self) -> PortfolioModel:
+        return PortfolioModel(positions=self.positions)
+
+    def _grow(self):
+        capacity = 2 * len(self._quantity)
+        for name in ("_quantity", "_entry_price"):
+            column = np.zeros(capacity)
+            column[:len(self.assets)] = getattr(self, name)[:len(self.assets)]
+            setattr(self, name, column)
+        prices = np.full(capacity, np.nan)
+        prices[:len(self.assets)] = self._current_price[:len(self.assets)]
+        self._current_price = prices
@@ -1,15 +1,19 @@
-from dataclasses import dataclass, asdict
-from typing import Optional
+import math
+import struct
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple, Union
+
+# Binary layout: record count, then per position the UTF-8 asset length and
+# bytes followed by quantity, entry and current price (NaN when unset)
+_COUNT = struct.Struct("<I")
+_ASSET_LENGTH = struct.Struct("<H")
+_VALUES = struct.Struct("<ddd")
+
+PositionRecord = Tuple[str, float, float, Optional[float]]
 
-@dataclass
-class PositionModel:
-    """
-    Represents a single asset position in a portfolio.
-    """
-    asset: str
-    quantity: float
-    entry_price: float
-    current_price: Optional[float] = None
+
+class _PositionMethods:
+    __slots__ = ()
 
     def pnl(self) -> Optional[float]:
         """
@@ -22,10 +26,19 @@ class PositionModel:
 
     def to_dict(self) -> dict:
         """Serialize to a plain dict."""
-        return asdict(self)
+        return {
+            "asset": self.asset,
+            "quantity": self.quantity,
+            "entry_price": self.entry_price,
+            "current_price": self.current_price,
+        }
+
+    def to_record(self) -> PositionRecord:
+        """Serialize to an (asset, quantity, entry_price, current_price) tuple."""
+        return (self.asset, self.quantity, self.entry_price, self.current_price)
 
     @classmethod
-    def from_dict(cls, data: dict) -> "PositionModel":
+    def from_dict(cls, data: dict):
         """Deserialize from a dict."""
         return cls(
             asset=data["asset"],
@@ -33,3 +46,68 @@ class PositionModel:
             entry_price=data["entry_price"],
             current_price=data.get("current_price"),
         )
+
+
+@dataclass
+class PositionModel(_PositionMethods):
+    """
+    Represents a single asset position in a portfolio.
+    """
+    asset: str
+    quantity: float
+    entry_price: float
+    current_price: Optional[float] = None
+
+
+@dataclass(slots=True)
+class CompactPositionModel(_PositionMethods):
+    """
+    Slotted PositionModel without a per-instance __dict__, for large snapshots.
+    """
+    asset: str
+    quantity: float
+    entry_price: float
+    current_price: Optional[float] = None
+
+
+AnyPosition = Union[PositionModel, CompactPositionModel]
+
+
+def to_records(positions: Iterable[AnyPosition]) -> List[PositionRecord]:
+    """Convert positions to plain field tuples."""
+    return [(p.asset, p.quantity, p.entry_price, p.current_price) for p in positions]
+
+
+def from_records(records: Iterable[PositionRecord], compact: bool = True) -> List[AnyPosition]:
+    """Build positions from field tuples."""
+    cls = CompactPositionModel if compact else PositionModel
+    return [cls(*record) for record in records]
+
+
+def pack_positions(positions: Iterable[AnyPosition]) -> bytes:
+    """Serialize positions to a compact little-endian binary blob."""
+    parts = [b""]
+    for asset, quantity, entry_price, current_price in to_records(positions):
+        encoded = asset.encode("utf-8")
+        parts.append(_ASSET_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+        parts.append(_VALUES.pack(quantity, entry_price, math.nan if current_price is None else current_price))
+    parts[0] = _COUNT.pack((len(parts) - 1) // 3)
+    return b"".join(parts)
+
+
+def unpack_positions(data: bytes, compact: bool = True) -> List[AnyPosition]:
+    """Deserialize positions written by `pack_positions`."""
+    view = memoryview(data)
+    (count,) = _COUNT.unpack_from(view, 0)
+    offset = _COUNT.size
+    records = []
+    for _ in range(count):
+        (length,) = _ASSET_LENGTH.unpack_from(view, offset)
+        offset += _ASSET_LENGTH.size
+        asset = str(view[offset:offset + length], "utf-8")
+        offset += length
+        quantity, entry_price, current_price = _VALUES.unpack_from(view, offset)
+        offset += _VALUES.size
+        records.append((asset, quantity, entry_price, None if math.isnan(current_price) else current_price))
+    return from_records(records, compact)
@@ -0,0 +1,70 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List
+
+logger = logging.getLogger("KQI Contract Registry")
+
+ERC20_ABI_PATH = 'assets/erc20_abi.json'
+
+
+@lru_cache(maxsize=None)
+def load_abi(abi_path: str) -> List[dict]:
+    """
+    Parse an ABI file once per process.
+
+    The returned list is shared by every caller and must not be mutated.
+    """
+    with open(abi_path) as f:
+        return json.load(f)
+
+
+class ContractRegistry:
+    """
+    Bounded LRU cache of contract interfaces shared by all wallets.
+
+    Entries are keyed by (chain_id, address, abi_path). A contract is bound
+    to the web3 instance that first requested it; wallets on the same
+    endpoints share one provider pool, so the interface is reusable by all
+    of them.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._contracts: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_contract(self, web3: Any, chain_id: int, address: str, abi_path: str = ERC20_ABI_PATH) -> Any:
+        """Return the cached contract interface, building it on first use"""
+        key = (chain_id, address.lower(), abi_path)
+        with self._lock:
+            contract = self._contracts.get(key)
+            if contract is not None:
+                self._contracts.move_to_end(key)
+                self.hits += 1
+                return contract
+
+        contract = web3.eth.contract(address=address, abi=load_abi(abi_path))
+        with self._lock:
+            self._contracts[key] = contract
+            self._contracts.move_to_end(key)
+            self.misses += 1
+            while len(self._contracts) > self.max_size:
+                self._contracts.popitem(last=False)
+        return contract
+
+    def clear(self):
+        """Drop every cached contract interface"""
+        with self._lock:
+            self._contracts.clear()
+
+    def __len__(self) -> int:
+        return len(self._contracts)
+
+
+# Process-wide registry shared by every KQIWallet
+contract_registry = ContractRegistry()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from statistics import median
+from typing import Any, Dict, Optional, Tuple, Union
+
+from security.rpc_Client import JSONRPCClient, RPCError
+
+logger = logging.getLogger("KQI Gas Oracle")
+
+# JSON-RPC "method not found"
+METHOD_NOT_FOUND = -32601
+
+
+def _is_method_not_found(error: Exception) -> bool:
+    """Return True if the node does not implement the requested method"""
+    if isinstance(error, RPCError):
+        code = error.code
+    else:
+        # web3's Web3RPCError carries the raw response
+        response = getattr(error, 'rpc_response', None) or {}
+        code = (response.get('error') or {}).get('code')
+    if code == METHOD_NOT_FOUND:
+        return True
+    message = str(error).lower()
+    return 'method not found' in message or 'does not exist' in message or 'not supported' in message
+
+
+def _selector(data: Union[bytes, str, None]) -> str:
+    """Return the 4-byte function selector of calldata as hex ('' for plain transfers)"""
+    if not data:
+        return ''
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data[:4]).hex()
+    data = data[2:] if data.startswith('0x') else data
+    return data[:8].lower()
+
+
+class GasOracle:
+    """
+    Caches fee data and gas estimates so sends skip pre-signing round-trips.
+
+    Fees come from a single `eth_feeHistory` call that is reused for
+    `max_age` seconds (roughly one block). EIP-1559 fees are derived from
+    the next block's base fee and the median priority fee paid over recent
+    blocks; chains without EIP-1559 (no `eth_feeHistory` or no base fee)
+    fall back to a cached legacy gas price.
+    Gas estimates are cached per (to, function selector) template and padded
+    with a safety margin.
+    """
+
+    def __init__(
+        self,
+        web3: Any,
+        max_age: float = 2.0,
+        history_blocks: int = 10,
+        reward_percentile: float = 50,
+        base_fee_multiplier: float = 2.0,
+        legacy_price_multiplier: Decimal = Decimal('1.1'),
+        estimate_margin: float = 1.1,
+        estimate_ttl: float = 300.0,
+        max_estimates: int = 4096,
+        rpc: Optional[JSONRPCClient] = None
+    ):
+        self.web3 = web3
+        self.rpc = rpc
+        self.max_age = max_age
+        self.history_blocks = history_blocks
+        self.reward_percentile = reward_percentile
+        self.base_fee_multiplier = base_fee_multiplier
+        self.legacy_price_multiplier = legacy_price_multiplier
+        self.estimate_margin = estimate_margin
+        self.estimate_ttl = estimate_ttl
+        self.max_estimates = max_estimates
+        self._fees: Optional[Dict[str, int]] = None
+        self._fees_at = 0.0
+        self._fees_lock = asyncio.Lock()
+        self._supports_eip1559 = True
+        self._estimates: Dict[Tuple[str, str], Tuple[int, float]] = {}
+
+    async def fee_fields(self, legacy_price_multiplier: Optional[Decimal] = None) -> Dict[str, int]:
+        """
+        Return the fee fields to merge into a transaction.
+
+        Either `maxFeePerGas`/`maxPriorityFeePerGas` or a legacy `gasPrice`.
+        The cached legacy price is scaled per call, by `legacy_price_multiplier`
+        or else the oracle's default, so callers sharing the oracle can each
+        use their own multiplier.
+        """
+        if self._fees is None or time.monotonic() - self._fees_at >= self.max_age:
+            async with self._fees_lock:
+                # Another sender may have refreshed while we waited for the lock
+                if self._fees is None or time.monotonic() - self._fees_at >= self.max_age:
+                    self._fees = await self._fetch_fees()
+                    self._fees_at = time.monotonic()
+        fees = dict(self._fees)
+        if 'gasPrice' in fees:
+            multiplier = self.legacy_price_multiplier if legacy_price_multiplier is None else legacy_price_multiplier
+            fees['gasPrice'] = int(fees['gasPrice'] * multiplier)
+        return fees
+
+    async def _fetch_fees(self) -> Dict[str, int]:
+        if self._supports_eip1559:
+            try:
+                history = await self.web3.eth.fee_history(
+                    self.history_blocks, 'latest', [self.reward_percentile]
+                )
+            except Exception as e:
+                if not _is_method_not_found(e):
+                    # Transient failure: do not give up on EIP-1559 for good
+                    raise
+                logger.info(f"Fee history unavailable ({e}); using legacy gas price")
+                history = None
+            base_fees = history.get('baseFeePerGas') if history else None
+            if base_fees and base_fees[-1]:
+                # The last entry is the base fee of the next, not yet mined, block
+                next_base_fee = base_fees[-1]
+                rewards = [reward[0] for reward in history.get('reward') or [] if reward and reward[0]]
+                priority_fee = int(median(rewards)) if rewards else await self.web3.eth.max_priority_fee
+                return {
+                    'maxFeePerGas': int(next_base_fee * self.base_fee_multiplier) + priority_fee,
+                    'maxPriorityFeePerGas': priority_fee
+                }
+            # No base fee: the chain does not run EIP-1559
+            self._supports_eip1559 = False
+
+        gas_price = await self.web3.eth.gas_price
+        return {'gasPrice': int(gas_price)}
+
+    async def estimate_gas(self, tx: Dict) -> int:
+        """
+        Return a padded gas limit for `tx`, reusing estimates of the same template.
+        """
+        key = (str(tx.get('to') or '').lower(), _selector(tx.get('data')))
+        cached = self._estimates.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.estimate_ttl:
+            return int(cached[0] * self.estimate_margin)
+
+        estimated_gas = await self.web3.eth.estimate_gas(tx)
+        if len(self._estimates) >= self.max_estimates:
+            # Evict the oldest template
+            self._estimates.pop(next(iter(self._estimates)))
+        self._estimates[key] = (estimated_gas, time.monotonic())
+        return int(estimated_gas * self.estimate_margin)
+
+    def invalidate(self):
+        """Forget cached fees and gas estimates"""
+        self._fees = None
+        self._estimates.clear()
+
+
+# One oracle per shared RPC client, used by every wallet on that client
+_oracles: Dict[tuple, GasOracle] = {}
+
+
+def get_gas_oracle(web3: Any, rpc: JSONRPCClient, **kwargs: Any) -> GasOracle:
+    """
+    Return the shared gas oracle for `rpc`
+
+    Keyword arguments configure the oracle when it is created; per-caller
+    settings such as the legacy price multiplier go to `fee_fields`.
+    """
+    key = (tuple(rpc.rpc_urls), id(rpc))
+    oracle = _oracles.get(key)
+    if oracle is None or oracle.rpc is not rpc:
+        oracle = GasOracle(web3, rpc=rpc, **kwargs)
+        _oracles[key] = oracle
+    return oracle
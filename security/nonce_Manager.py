@@ -0,0 +1,118 @@
+import asyncio
+import heapq
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger("KQI Nonce Manager")
+
+
+def is_nonce_too_low(error: Exception) -> bool:
+    """
+    Return True if a node rejected a transaction because its nonce was already used.
+    """
+    message = str(error).lower()
+    return "nonce too low" in message or "nonce is too low" in message
+
+
+def is_already_known(error: Exception) -> bool:
+    """
+    Return True if a node rejected a transaction because it already holds it.
+    """
+    message = str(error).lower()
+    return "already known" in message or "known transaction" in message
+
+
+class NonceManager:
+    """
+    Local nonce allocator for a single sending address.
+
+    The first allocation reads the pending transaction count from the chain;
+    every allocation after that is served locally, so concurrent sends from
+    one agent never race for the same nonce and skip an RPC round-trip.
+    Nonces released by transactions that were never broadcast are handed out
+    again before new ones, so a failed send does not leave a gap that would
+    stall every later transaction.
+    """
+
+    def __init__(self, fetch_nonce: Callable[[], Awaitable[int]]):
+        """
+        Args:
+            fetch_nonce: Coroutine function returning the address's pending
+                         transaction count from the chain.
+        """
+        self._fetch_nonce = fetch_nonce
+        self._next: Optional[int] = None
+        self._released: List[int] = []
+        self._lock = asyncio.Lock()
+
+    async def allocate(self) -> int:
+        """
+        Reserve the next nonce, syncing with the chain on first use.
+        """
+        async with self._lock:
+            if self._next is None:
+                self._next = await self._fetch_nonce()
+                logger.info(f"Nonce synced from chain: {self._next}")
+            if self._released:
+                return heapq.heappop(self._released)
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    async def allocate_many(self, count: int) -> List[int]:
+        """
+        Reserve `count` nonces at once for a pipelined batch of transactions.
+        """
+        return [await self.allocate() for _ in range(count)]
+
+    def release(self, nonce: int) -> None:
+        """
+        Return a nonce whose transaction was never broadcast so it can be reused.
+        """
+        if self._next is not None and nonce < self._next and nonce not in self._released:
+            heapq.heappush(self._released, nonce)
+
+    async def resync(self) -> int:
+        """
+        Re-read the chain's pending count after a "nonce too low" rejection.
+
+        Locally allocated nonces that are still ahead of the chain are kept, so
+        in-flight transactions are not handed out twice; released nonces the
+        chain has already consumed are discarded.
+
+        Returns:
+            int: The next fresh nonce after resyncing.
+        """
+        async with self._lock:
+            chain_nonce = await self._fetch_nonce()
+            self._next = chain_nonce if self._next is None else max(self._next, chain_nonce)
+            self._released = [n for n in self._released if n >= chain_nonce]
+            heapq.heapify(self._released)
+            logger.info(f"Nonce resynced from chain: {chain_nonce} (next local nonce {self._next})")
+            return self._next
+
+    async def reclaim(self, nonces: List[int]) -> None:
+        """
+        Recover nonces whose send failed in transport, so it is unknown whether
+        the node received them.
+
+        The chain's pending count is re-read; nonces it has consumed stay used
+        and the rest are released for reuse.
+        """
+        async with self._lock:
+            chain_nonce = await self._fetch_nonce()
+            self._next = chain_nonce if self._next is None else max(self._next, chain_nonce)
+            self._released = [n for n in self._released if n >= chain_nonce]
+            heapq.heapify(self._released)
+        for nonce in nonces:
+            if nonce >= chain_nonce:
+                self.release(nonce)
+        logger.info(f"Nonces reclaimed after failed send (chain nonce {chain_nonce})")
+
+    async def reset(self) -> None:
+        """
+        Forget all local state; the next allocation re-reads the chain.
+        """
+        async with self._lock:
+            self._next = None
+            self._released = []
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set
+
+from security.rpc_Client import JSONRPCClient
+
+logger = logging.getLogger("KQI Receipt Watcher")
+
+
+def normalize_tx_hash(tx_hash: str) -> str:
+    """Return a lowercase, 0x-prefixed transaction hash"""
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith('0x') else f'0x{tx_hash}'
+
+
+class ReceiptWatcher:
+    """
+    Tracks every pending transaction hash on one RPC endpoint.
+
+    Instead of each waiter polling its own receipt, a single background task
+    polls the block number and, once per new block, fetches the receipts of
+    all pending hashes in one JSON-RPC batch. Newly added hashes are looked
+    up on the next tick even if no block arrived, since they may already be
+    mined. The task only runs while there is something to wait for.
+    """
+
+    def __init__(self, rpc: JSONRPCClient, poll_interval: float = 0.5):
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        self._fresh: Set[str] = set()  # Hashes not yet looked up
+        self._intervals: List[float] = []  # Poll intervals requested by active waiters
+        self._task: Optional[asyncio.Task] = None
+        self._last_block: Optional[int] = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def wait_for_receipt(
+        self,
+        tx_hash: str,
+        timeout: float = 180,
+        poll_interval: Optional[float] = None
+    ) -> dict:
+        """
+        Wait until `tx_hash` is mined and return its receipt.
+
+        `poll_interval` shortens the watcher's polling only while this call waits.
+
+        Raises:
+            TimeoutError: If no receipt is seen within `timeout` seconds.
+            RPCError: If the node returned an error for this receipt lookup.
+        """
+        tx_hash = normalize_tx_hash(tx_hash)
+        future = self._pending.get(tx_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[tx_hash] = future
+            self._fresh.add(tx_hash)
+        self._waiters[tx_hash] = self._waiters.get(tx_hash, 0) + 1
+        interval = self.poll_interval if poll_interval is None else poll_interval
+        self._intervals.append(interval)
+        self._ensure_running()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Transaction {tx_hash} not confirmed after {timeout} seconds")
+        finally:
+            self._intervals.remove(interval)
+            self._waiters[tx_hash] -= 1
+            if self._waiters[tx_hash] == 0:
+                del self._waiters[tx_hash]
+                self._pending.pop(tx_hash, None)
+                self._fresh.discard(tx_hash)
+                if not future.done():
+                    future.cancel()
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        while self._pending:
+            try:
+                block = int(await self.rpc.request('eth_blockNumber'), 16)
+                if block != self._last_block:
+                    self._last_block = block
+                    await self._check_pending(list(self._pending))
+                elif self._fresh:
+                    await self._check_pending(list(self._fresh))
+            except Exception as e:
+                logger.warning(f"Receipt polling failed: {e}")
+            await asyncio.sleep(min(self._intervals, default=self.poll_interval))
+
+    async def _check_pending(self, candidates: List[str]):
+        self._fresh.difference_update(candidates)
+        hashes = [
+            tx_hash for tx_hash in candidates
+            if tx_hash in self._pending and not self._pending[tx_hash].done()
+        ]
+        if not hashes:
+            return
+        receipts = await self.rpc.batch(
+            [('eth_getTransactionReceipt', [tx_hash]) for tx_hash in hashes],
+            raise_errors=False
+        )
+        for tx_hash, receipt in zip(hashes, receipts):
+            future = self._pending.get(tx_hash)
+            if receipt is None or future is None or future.done():
+                continue
+            # Only the waiter whose lookup failed sees the error
+            if isinstance(receipt, Exception):
+                future.set_exception(receipt)
+            else:
+                future.set_result(receipt)
+
+
+# One watcher per shared RPC client, used by every wallet on that client
+_watchers: Dict[tuple, ReceiptWatcher] = {}
+
+
+def get_receipt_watcher(rpc: JSONRPCClient, poll_interval: float = 0.5) -> ReceiptWatcher:
+    """Return the shared receipt watcher for `rpc`"""
+    key = (tuple(rpc.rpc_urls), id(rpc))
+    watcher = _watchers.get(key)
+    if watcher is None or watcher.rpc is not rpc:
+        watcher = ReceiptWatcher(rpc, poll_interval)
+        _watchers[key] = watcher
+    return watcher
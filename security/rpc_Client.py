@@ -0,0 +1,246 @@
+import asyncio
+import itertools
+import logging
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import aiohttp
+from web3.providers.async_base import AsyncBaseProvider
+
+logger = logging.getLogger("KQI RPC Client")
+
+# HTTP statuses worth retrying on the same or the next endpoint
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Methods with side effects: resending after the node may already have acted
+# would double-submit, so they are only retried when the request provably
+# never reached the node (connection refused or rate limited)
+NON_IDEMPOTENT_METHODS = {'eth_sendRawTransaction', 'eth_sendTransaction'}
+
+
+class RPCError(Exception):
+    """Error object returned by a JSON-RPC node"""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class RetryableHTTPError(Exception):
+    """HTTP status that should be retried (rate limiting or server errors)"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+# Failures where the request may or may not have reached the node
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, RetryableHTTPError)
+
+
+def _is_idempotent(method: str) -> bool:
+    return method not in NON_IDEMPOTENT_METHODS
+
+
+class JSONRPCClient:
+    """
+    Asynchronous JSON-RPC client over a persistent keep-alive connection pool.
+
+    A batch packs many calls into a single HTTP POST, so reading N values
+    costs one round-trip instead of N. Transport failures are retried with
+    exponential backoff and full jitter, failing over to the next URL in
+    `rpc_urls` each time. Requests containing a NON_IDEMPOTENT_METHODS call
+    are only retried when the node cannot have received them.
+    """
+
+    def __init__(
+        self,
+        rpc_urls: Union[str, Sequence[str]],
+        max_connections: int = 100,
+        request_timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0
+    ):
+        self.rpc_urls = [rpc_urls] if isinstance(rpc_urls, str) else list(rpc_urls)
+        if not self.rpc_urls:
+            raise ValueError("At least one RPC URL is required")
+        self.max_connections = max_connections
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._active = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids = itertools.count(1)
+
+    @property
+    def rpc_url(self) -> str:
+        """The endpoint currently receiving requests"""
+        return self.rpc_urls[self._active]
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _post(self, payload: Any, idempotent: bool = True) -> Any:
+        session = await self._get_session()
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            url = self.rpc_url
+            try:
+                async with session.post(url, json=payload) as response:
+                    if response.status in RETRYABLE_STATUSES:
+                        raise RetryableHTTPError(f"HTTP {response.status} from {url}", response.status)
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            except aiohttp.ClientResponseError:
+                # Non-retryable 4xx: the request itself is wrong
+                raise
+            except TRANSPORT_ERRORS as e:
+                last_error = e
+                if attempt == self.max_retries or not (idempotent or self._never_delivered(e)):
+                    break
+                self._failover(url, e)
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                await asyncio.sleep(random.uniform(0, delay))
+        raise last_error
+
+    @staticmethod
+    def _never_delivered(error: Exception) -> bool:
+        if isinstance(error, RetryableHTTPError):
+            return error.status == 429
+        return isinstance(error, aiohttp.ClientConnectorError)
+
+    def _failover(self, failed_url: str, error: Exception):
+        if len(self.rpc_urls) > 1 and self.rpc_url == failed_url:
+            self._active = (self._active + 1) % len(self.rpc_urls)
+            logger.warning(f"RPC request to {failed_url} failed ({error!r}); failing over to {self.rpc_url}")
+
+    async def request(self, method: str, params: Sequence = ()) -> Any:
+        """Send a single JSON-RPC request and return its result"""
+        reply = await self._post(self._envelope(method, params), _is_idempotent(method))
+        return self._unwrap(reply)
+
+    async def request_raw(self, method: str, params: Sequence = ()) -> dict:
+        """Send a single JSON-RPC request and return the full response object"""
+        return await self._post(self._envelope(method, params), _is_idempotent(method))
+
+    async def batch(self, calls: Sequence[Tuple[str, Sequence]], raise_errors: bool = True) -> List[Any]:
+        """
+        Send many (method, params) calls in one JSON-RPC batch.
+
+        Results are returned in the order of `calls`. The first error object
+        in the reply is raised as an RPCError, unless `raise_errors` is False,
+        in which case each failed call's RPCError is returned in its place.
+        """
+        if not calls:
+            return []
+        payload = [self._envelope(method, params) for method, params in calls]
+        replies = await self._post(payload, all(_is_idempotent(method) for method, _ in calls))
+        if not isinstance(replies, list):
+            # Nodes answer a rejected batch with a single error object
+            self._unwrap(replies)
+            raise RPCError(-32603, "Malformed batch response")
+
+        by_id = {reply.get('id'): reply for reply in replies}
+        results = []
+        for request in payload:
+            reply = by_id.get(request['id'])
+            try:
+                if reply is None:
+                    raise RPCError(-32603, f"Missing response for request {request['id']}")
+                results.append(self._unwrap(reply))
+            except RPCError as e:
+                if raise_errors:
+                    raise
+                results.append(e)
+        return results
+
+    def _envelope(self, method: str, params: Sequence) -> dict:
+        return {'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': list(params or ())}
+
+    @staticmethod
+    def _unwrap(reply: dict) -> Any:
+        if 'error' in reply and reply['error'] is not None:
+            error = reply['error']
+            raise RPCError(error.get('code', -32603), error.get('message', ''), error.get('data'))
+        return reply.get('result')
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class PooledAsyncProvider(AsyncBaseProvider):
+    """web3 async provider that sends requests through a shared JSONRPCClient"""
+
+    def __init__(self, client: JSONRPCClient, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.client = client
+
+    async def make_request(self, method, params) -> Dict:
+        return await self.client.request_raw(method, params)
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            await self.client.request('eth_chainId')
+            return True
+        except Exception:
+            if show_traceback:
+                raise
+            return False
+
+
+# Clients are shared by every wallet on the same list of endpoints and
+# settings so they reuse one keep-alive pool instead of each opening its own
+# connections
+_clients: Dict[tuple, JSONRPCClient] = {}
+_client_refs: Dict[tuple, int] = {}
+
+
+def acquire_rpc_client(rpc_urls: Sequence[str], **kwargs: Any) -> JSONRPCClient:
+    """
+    Return the shared client for `rpc_urls` and the given settings, creating
+    it on first use.
+
+    Callers asking for different keyword arguments (timeouts, retries, pool
+    size) on the same endpoints get separate clients, so each one's settings
+    are honoured.
+    """
+    key = (tuple(rpc_urls), tuple(sorted(kwargs.items())))
+    client = _clients.get(key)
+    if client is None:
+        client = JSONRPCClient(list(rpc_urls), **kwargs)
+        _clients[key] = client
+    _client_refs[key] = _client_refs.get(key, 0) + 1
+    return client
+
+
+async def release_rpc_client(client: JSONRPCClient):
+    """Drop one reference to a shared client, closing it when unused"""
+    key = next((k for k, c in _clients.items() if c is client), None)
+    if key is None:
+        await client.close()
+        return
+    _client_refs[key] -= 1
+    if _client_refs[key] <= 0:
+        del _clients[key]
+        del _client_refs[key]
+        await client.close()
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from eth_account import Account
+
+logger = logging.getLogger("KQI Transaction Signer")
+
+
+def raw_transaction_bytes(signed_tx) -> bytes:
+    """Return the RLP-encoded bytes of a signed transaction across eth-account versions"""
+    raw = getattr(signed_tx, 'raw_transaction', None)
+    return raw if raw is not None else signed_tx.rawTransaction
+
+
+def _sign_chunk(transactions: List[Dict], private_key: str) -> List[bytes]:
+    """Sign a chunk of transactions; runs inside a worker thread or process"""
+    return [
+        bytes(raw_transaction_bytes(Account.sign_transaction(tx, private_key)))
+        for tx in transactions
+    ]
+
+
+class TransactionSigner:
+    """
+    Signs batches of prepared transactions on a worker pool.
+
+    secp256k1 signing and RLP encoding are CPU-bound, so signing hundreds of
+    transactions inline would stall every other coroutine on the event loop.
+    Batches are split into one chunk per worker to keep scheduling overhead
+    low. Process workers sign in parallel but receive the private key over a
+    local pipe; thread workers keep the key in-process.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, use_processes: bool = False):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            pool = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._executor = pool(max_workers=self.max_workers)
+        return self._executor
+
+    async def sign_many(self, transactions: List[Dict], private_key: str) -> List[bytes]:
+        """
+        Sign `transactions` off the event loop.
+
+        Returns:
+            List[bytes]: Raw signed transactions in the order given, ready for
+                         `eth_sendRawTransaction`.
+        """
+        if not transactions:
+            return []
+        chunk_size = -(-len(transactions) // self.max_workers)
+        chunks = [transactions[i:i + chunk_size] for i in range(0, len(transactions), chunk_size)]
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        signed_chunks = await asyncio.gather(
+            *(loop.run_in_executor(executor, _sign_chunk, chunk, private_key) for chunk in chunks)
+        )
+        return [raw for chunk in signed_chunks for raw in chunk]
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Signers are shared process-wide per pool configuration
+_signers: Dict[Tuple[Optional[int], bool], TransactionSigner] = {}
+
+
+def get_transaction_signer(max_workers: Optional[int] = None, use_processes: bool = False) -> TransactionSigner:
+    """Return the shared signer for a pool configuration"""
+    key = (max_workers, use_processes)
+    signer = _signers.get(key)
+    if signer is None:
+        signer = TransactionSigner(max_workers, use_processes)
+        _signers[key] = signer
+    return signer
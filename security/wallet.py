@@ -1,15 +1,29 @@
 from typing import Dict, List, Optional
 import logging
 from eth_account import Account
-from web3 import Web3
+from web3 import AsyncWeb3, Web3
 from eth_typing import Address
+from eth_abi import decode
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 import asyncio
-from web3.exceptions import TransactionNotFound
-import time
+from security.nonce_Manager import NonceManager, is_already_known, is_nonce_too_low
+from security.rpc_Client import TRANSPORT_ERRORS, PooledAsyncProvider, acquire_rpc_client, release_rpc_client
+from security.receipt_Watcher import get_receipt_watcher
+from security.contract_Registry import contract_registry
+from security.gas_Oracle import get_gas_oracle
+from security.tx_Signer import get_transaction_signer, raw_transaction_bytes
+
+# ERC20 function selectors used for batched reads
+DECIMALS_SELECTOR = '0x313ce567'
+SYMBOL_SELECTOR = '0x95d89b41'
+BALANCE_OF_SELECTOR = '0x70a08231'
+
+# decimals/symbol never change, so they are cached for the process lifetime
+# keyed by (chain_id, lowercased token address)
+_token_metadata: Dict[tuple, tuple] = {}
 
 @dataclass
 class WalletConfig:
@@ -17,6 +31,14 @@ class WalletConfig:
     rpc_url: str
     gas_limit: int = 250000
     gas_price_multiplier: Decimal = Decimal('1.1')
+    fallback_rpc_urls: List[str] = field(default_factory=list)  # Tried in order when rpc_url fails
+    # Wallets on the same endpoints share one RPC client only when these three
+    # settings match; differing values get a client (and pool) of their own
+    max_connections: int = 100  # Keep-alive pool size of the shared client
+    request_timeout: float = 10.0  # Seconds per RPC request
+    max_retries: int = 3  # Retries with jittered backoff, failing over between endpoints
+    signing_workers: Optional[int] = None  # Batch signing pool size (defaults to CPU count, max 8)
+    signing_processes: bool = False  # Sign batches in worker processes instead of threads
 
 @dataclass
 class TokenBalance:
@@ -31,10 +53,19 @@ class KQIWallet:
     def __init__(self, config: WalletConfig):
         self.logger = logging.getLogger(__name__)
         self.config = config
-        self.web3 = Web3(Web3.HTTPProvider(config.rpc_url))
+        self.rpc = acquire_rpc_client(
+            [config.rpc_url, *config.fallback_rpc_urls],
+            max_connections=config.max_connections,
+            request_timeout=config.request_timeout,
+            max_retries=config.max_retries
+        )
+        self.web3 = AsyncWeb3(PooledAsyncProvider(self.rpc))
         self._private_key = None
         self._address = None
-        self.token_cache = {}  # Cache for token contract interfaces
+        self.nonce_manager = NonceManager(self._fetch_pending_nonce)
+        self.receipt_watcher = get_receipt_watcher(self.rpc)
+        self.gas_oracle = get_gas_oracle(self.web3, self.rpc)
+        self.signer = get_transaction_signer(config.signing_workers, config.signing_processes)
         
     async def initialize(self, private_key: Optional[str] = None):
         """Initialize wallet with private key or generate new one"""
@@ -63,46 +94,79 @@ class KQIWallet:
         
     async def get_token_balance(self, token_address: str) -> TokenBalance:
         """Get balance of specific ERC20 token"""
-        if token_address not in self.token_cache:
-            # Load standard ERC20 ABI
-            with open('assets/erc20_abi.json') as f:
-                token_abi = json.load(f)
-            self.token_cache[token_address] = self.web3.eth.contract(
-                address=token_address,
-                abi=token_abi
-            )
+        balances = await self.get_token_balances([token_address])
+        return balances[0]
+        
+    async def get_token_balances(self, token_addresses: List[str]) -> List[TokenBalance]:
+        """
+        Get balances of many ERC20 tokens in a single JSON-RPC batch.
+        
+        decimals/symbol are only requested for tokens not seen before in
+        this process, so a warm portfolio costs one balanceOf per token,
+        all sent in one round-trip.
+        """
+        owner = self.get_address()[2:].lower().rjust(64, '0')
+        calls = []
+        # Whether each entry carries decimals/symbol calls; parsing must follow
+        # these flags, not the cache, which concurrent calls may fill meanwhile
+        requests_metadata = []
+        requested = set()
+        for address in token_addresses:
+            key = (self.config.chain_id, address.lower())
+            needs_metadata = key not in _token_metadata and key not in requested
+            if needs_metadata:
+                requested.add(key)
+                calls.append(('eth_call', [{'to': address, 'data': DECIMALS_SELECTOR}, 'latest']))
+                calls.append(('eth_call', [{'to': address, 'data': SYMBOL_SELECTOR}, 'latest']))
+            requests_metadata.append(needs_metadata)
+            calls.append(('eth_call', [{'to': address, 'data': BALANCE_OF_SELECTOR + owner}, 'latest']))
             
-        token = self.token_cache[token_address]
-        decimals = await token.functions.decimals().call()
-        symbol = await token.functions.symbol().call()
-        balance = await token.functions.balanceOf(self.get_address()).call()
-        
-        return TokenBalance(
-            token_address=token_address,
-            symbol=symbol,
-            balance=Decimal(balance) / Decimal(10**decimals),
-            decimals=decimals
-        )
+        results = iter(await self.rpc.batch(calls))
+        metadata = {}
+        balances = []
+        for address, needs_metadata in zip(token_addresses, requests_metadata):
+            key = (self.config.chain_id, address.lower())
+            if needs_metadata:
+                decimals = int(next(results), 16)
+                symbol = _decode_symbol(next(results))
+                metadata[key] = _token_metadata[key] = (symbol, decimals)
+            symbol, decimals = metadata.get(key) or _token_metadata[key]
+            balance = int(next(results), 16)
+            balances.append(TokenBalance(
+                token_address=address,
+                symbol=symbol,
+                balance=Decimal(balance) / Decimal(10**decimals),
+                decimals=decimals
+            ))
+        return balances
         
-    async def send_transaction(
+    async def _fetch_pending_nonce(self) -> int:
+        """Read the wallet's pending transaction count from the chain"""
+        return await self.web3.eth.get_transaction_count(self.get_address(), 'pending')
+        
+    async def _build_transaction(
         self,
         to_address: str,
-        value: int = 0,
-        data: bytes = b'',
-        gas_price: Optional[int] = None
-    ) -> str:
-        """Send transaction with automatic gas estimation"""
-        if not self._private_key:
-            raise ValueError("Wallet not initialized")
-            
-        nonce = await self.web3.eth.get_transaction_count(self.get_address())
+        value: int,
+        data: bytes,
+        gas_price: Optional[int],
+        nonce: int
+    ) -> Dict:
+        """
+        Build an unsigned transaction with automatic fee and gas estimation
         
+        Fees and gas estimates come from the endpoint's shared GasOracle, so
+        repeated transactions usually need no RPC round-trip before signing.
+        An explicit `gas_price` produces a legacy transaction.
+        """
         if gas_price is None:
-            gas_price = int(await self.web3.eth.gas_price * self.config.gas_price_multiplier)
+            fee_fields = await self.gas_oracle.fee_fields(self.config.gas_price_multiplier)
+        else:
+            fee_fields = {'gasPrice': gas_price}
             
         tx = {
             'nonce': nonce,
-            'gasPrice': gas_price,
+            **fee_fields,
             'gas': self.config.gas_limit,
             'to': to_address,
             'value': value,
@@ -112,40 +176,167 @@ class KQIWallet:
         
         # Estimate gas and update limit
         try:
-            estimated_gas = await self.web3.eth.estimate_gas(tx)
-            tx['gas'] = int(estimated_gas * 1.1)  # Add 10% buffer
+            tx['gas'] = await self.gas_oracle.estimate_gas(tx)
         except Exception as e:
             self.logger.warning(f"Gas estimation failed: {e}. Using default gas limit.")
             
-        # Sign and send transaction
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self._private_key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        return tx
+        
+    async def send_transaction(
+        self,
+        to_address: str,
+        value: int = 0,
+        data: bytes = b'',
+        gas_price: Optional[int] = None,
+        nonce_retries: int = 2
+    ) -> str:
+        """Send transaction with automatic gas estimation and local nonce allocation"""
+        if not self._private_key:
+            raise ValueError("Wallet not initialized")
+            
+        for attempt in range(nonce_retries + 1):
+            nonce = await self.nonce_manager.allocate()
+            raw = None
+            try:
+                tx = await self._build_transaction(to_address, value, data, gas_price, nonce)
+                
+                # Sign and send transaction
+                signed_tx = self.web3.eth.account.sign_transaction(tx, self._private_key)
+                raw = raw_transaction_bytes(signed_tx)
+                tx_hash = await self.web3.eth.send_raw_transaction(raw)
+                return Web3.to_hex(tx_hash)
+            except Exception as e:
+                if raw is not None and is_already_known(e):
+                    # Already in the node's pool, so the send succeeded
+                    return Web3.to_hex(Web3.keccak(raw))
+                if is_nonce_too_low(e) and attempt < nonce_retries:
+                    # The chain already consumed this nonce; do not release it
+                    self.logger.warning(f"Nonce {nonce} rejected as too low, resyncing: {e}")
+                    await self.nonce_manager.resync()
+                    continue
+                if raw is not None and isinstance(e, TRANSPORT_ERRORS):
+                    # The node may have received it; only the chain can tell
+                    await self._reclaim_nonces([nonce])
+                else:
+                    # Never broadcast, so hand the nonce back to avoid a gap
+                    self.nonce_manager.release(nonce)
+                raise
+                
+    async def send_transactions(self, transactions: List[Dict]) -> List:
+        """
+        Pipeline many transactions back-to-back without waiting for each one.
+        
+        Each entry holds `send_transaction` keyword arguments. Nonces are
+        allocated locally in list order, so all sends are in flight at once.
+        Returns one transaction hash per entry, or the exception raised by
+        entries that failed.
+        """
+        return await asyncio.gather(
+            *(self.send_transaction(**tx) for tx in transactions),
+            return_exceptions=True
+        )
+        
+    async def sign_transactions(self, transactions: List[Dict]) -> List[bytes]:
+        """
+        Sign many prepared transactions on the signer's worker pool
+        
+        Returns raw signed transactions without blocking the event loop.
+        """
+        if not self._private_key:
+            raise ValueError("Wallet not initialized")
+        return await self.signer.sign_many(transactions, self._private_key)
         
-        return tx_hash.hex()
+    async def send_transaction_batch(self, transactions: List[Dict]) -> List:
+        """
+        Build, sign and submit many transactions in bulk.
+        
+        Each entry holds `to_address` and optionally `value`, `data` and
+        `gas_price`. Nonces are allocated in list order, signing runs off the
+        event loop and all raw transactions go out in one JSON-RPC batch.
+        Returns one 0x-prefixed transaction hash per entry, or the error for
+        entries the node rejected.
+        """
+        if not self._private_key:
+            raise ValueError("Wallet not initialized")
+            
+        nonces = await self.nonce_manager.allocate_many(len(transactions))
+        try:
+            prepared = await asyncio.gather(*(
+                self._build_transaction(
+                    tx['to_address'],
+                    tx.get('value', 0),
+                    tx.get('data', b''),
+                    tx.get('gas_price'),
+                    nonce
+                )
+                for tx, nonce in zip(transactions, nonces)
+            ))
+            raw_transactions = await self.sign_transactions(list(prepared))
+        except Exception:
+            for nonce in nonces:
+                self.nonce_manager.release(nonce)
+            raise
+            
+        try:
+            results = await self.rpc.batch(
+                [('eth_sendRawTransaction', [Web3.to_hex(raw)]) for raw in raw_transactions],
+                raise_errors=False
+            )
+        except Exception:
+            await self._reclaim_nonces(nonces)
+            raise
+            
+        resync = False
+        for i, (nonce, raw, result) in enumerate(zip(nonces, raw_transactions, results)):
+            if isinstance(result, Exception):
+                if is_already_known(result):
+                    # Already in the node's pool, so the send succeeded
+                    results[i] = Web3.to_hex(Web3.keccak(raw))
+                elif is_nonce_too_low(result):
+                    resync = True
+                else:
+                    # Never broadcast, so hand the nonce back to avoid a gap
+                    self.nonce_manager.release(nonce)
+        if resync:
+            await self.nonce_manager.resync()
+        return results
         
+    async def _reclaim_nonces(self, nonces: List[int]):
+        """
+        Recover nonces after a send whose delivery is unknown: keep the ones
+        the chain consumed and hand back the rest
+        """
+        try:
+            await self.nonce_manager.reclaim(nonces)
+        except Exception as e:
+            self.logger.warning(f"Nonce resync after failed send failed: {e}")
+            
     async def wait_for_transaction(
         self,
         tx_hash: str,
         timeout: int = 180,
         poll_interval: float = 0.5
     ) -> bool:
-        """Wait for transaction confirmation"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                receipt = await self.web3.eth.get_transaction_receipt(tx_hash)
-                if receipt:
-                    if receipt['status'] == 1:
-                        self.logger.info(f"Transaction {tx_hash} confirmed")
-                        return True
-                    else:
-                        self.logger.error(f"Transaction {tx_hash} failed")
-                        return False
-            except TransactionNotFound:
-                await asyncio.sleep(poll_interval)
-                continue
-                
-        raise TimeoutError(f"Transaction {tx_hash} not confirmed after {timeout} seconds")
+        """
+        Wait for transaction confirmation
+        
+        Receipts are fetched by the endpoint's shared ReceiptWatcher once per
+        new block for all pending hashes; `poll_interval` bounds how often it
+        checks for a new block while this call waits.
+        """
+        receipt = await self.receipt_watcher.wait_for_receipt(tx_hash, timeout, poll_interval)
+        if int(receipt['status'], 16) == 1:
+            self.logger.info(f"Transaction {tx_hash} confirmed")
+            return True
+        else:
+            self.logger.error(f"Transaction {tx_hash} failed")
+            return False
+            
+    async def wait_for_transactions(self, tx_hashes: List[str], timeout: int = 180) -> List[bool]:
+        """Wait for many transactions; all of them share one receipt poll per block"""
+        return await asyncio.gather(
+            *(self.wait_for_transaction(tx_hash, timeout) for tx_hash in tx_hashes)
+        )
         
     async def approve_token(
         self,
@@ -154,20 +345,24 @@ class KQIWallet:
         amount: Optional[int] = None
     ) -> str:
         """Approve spender for token transfers"""
-        token = self.token_cache.get(token_address)
-        if not token:
-            raise ValueError("Token not initialized")
+        # Contract interfaces are shared process-wide across wallets
+        token = contract_registry.get_contract(self.web3, self.config.chain_id, token_address)
             
         if amount is None:
             amount = 2**256 - 1  # Max uint256
             
-        data = token.functions.approve(
+        approve_tx = await token.functions.approve(
             spender_address,
             amount
-        ).build_transaction({'gas': 0, 'nonce': 0})['data']
+        ).build_transaction({'gas': 0, 'gasPrice': 0, 'nonce': 0, 'chainId': self.config.chain_id})
+        data = approve_tx['data']
         
         return await self.send_transaction(token_address, data=data)
         
+    async def close(self):
+        """Release this wallet's reference to the shared connection pool"""
+        await release_rpc_client(self.rpc)
+        
     def export_encrypted_keystore(self, password: str, path: str):
         """Export encrypted keystore file"""
         if not self._private_key:
@@ -194,6 +389,15 @@ class KQIWallet:
         asyncio.run(wallet.initialize(private_key.hex()))
         return wallet
 
+def _decode_symbol(raw: str) -> str:
+    """Decode an ERC20 symbol returned as an ABI string or as bytes32"""
+    data = bytes.fromhex(raw[2:] if raw.startswith('0x') else raw)
+    try:
+        return decode(['string'], data)[0]
+    except Exception:
+        # Older tokens (e.g. MKR) return a null-padded bytes32
+        return data[:32].rstrip(b'\x00').decode('utf-8', errors='replace')
+
 # Usage example:
 async def main():
     config = WalletConfig(
@@ -211,6 +415,8 @@ async def main():
     # USDC on Ethereum
     usdc_balance = await wallet.get_token_balance("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
     print(f"USDC Balance: {usdc_balance.balance} {usdc_balance.symbol}")
+    
+    await wallet.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
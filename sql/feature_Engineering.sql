@@ -1,4 +1,5 @@
 -- feature_engineering.sql
+-- Full recomputation; architecture/feature_Store.py maintains the same features incrementally per new bar.
 WITH base AS (
   SELECT
     trade_date,
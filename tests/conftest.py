@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules import each other from the repository root (e.g. `security.wallet`)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from training.data_processing import StreamingPreprocessor, preprocess_data
+
+
+def frame():
+    return pd.DataFrame({
+        'a': [1.0, 2.0, 3.0, None],
+        'c': ['x', None, 'y', 'x'],
+        'target': [0, 1, 0, 1],
+    })
+
+
+def test_refit_after_load_keeps_categorical_columns(tmp_path):
+    StreamingPreprocessor().fit(frame()).save(tmp_path / 'state.json')
+    preprocessor = StreamingPreprocessor.load(tmp_path / 'state.json')
+    preprocessor.fit(frame())
+    assert preprocessor.categories == {'c': ['x', 'y']}
+
+
+def test_refit_on_new_columns_replaces_column_list():
+    preprocessor = StreamingPreprocessor().fit(frame())
+    preprocessor.fit(frame()[['a', 'target']])
+    assert preprocessor.columns == ['a', 'target']
+    assert preprocessor.categories == {}
+
+
+def test_preprocess_data_keeps_integer_labels():
+    _, y = preprocess_data(frame())
+    assert y.dtype == np.int64
+    assert y.tolist() == [0, 1, 0, 1]
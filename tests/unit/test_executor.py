@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import yaml
+
+from core import executor as executor_module
+from core.executor import AgentExecutor, set_protocol_concurrency
+
+
+def write_config(path, execution):
+    path.write_text(yaml.safe_dump({
+        "agent": {
+            "name": path.stem,
+            "strategy": "arbitrage",
+            "risk_level": 1,
+            "protocols": ["uniswap", "uniswap"],
+            "execution": execution,
+        },
+        "api": {"key": "test"},
+    }))
+    return str(path)
+
+
+@pytest.fixture
+def protocol_limits(monkeypatch):
+    monkeypatch.setattr(executor_module, "_protocol_limits", {None: 1})
+
+
+def test_protocol_limit_is_shared_by_all_agents(tmp_path, monkeypatch, protocol_limits):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def trade(self, protocol):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    monkeypatch.setattr(AgentExecutor, "_simulate_trade", trade)
+    set_protocol_concurrency(2, "uniswap")
+    agents = [
+        AgentExecutor(write_config(tmp_path / f"agent_{i}.yaml", {"mode": "concurrent"}))
+        for i in range(3)
+    ]
+
+    async def main():
+        await asyncio.gather(*(agent.run_async() for agent in agents))
+
+    asyncio.run(main())
+    assert peak[0] == 2
+
+
+def test_per_agent_concurrency_key_is_rejected(tmp_path, protocol_limits):
+    config = write_config(tmp_path / "agent.yaml", {"mode": "concurrent", "max_concurrency_per_protocol": 4})
+    with pytest.raises(ValueError, match="set_protocol_concurrency"):
+        AgentExecutor(config).run()
@@ -0,0 +1,40 @@
+import asyncio
+from decimal import Decimal
+
+from security.gas_Oracle import GasOracle
+
+
+class LegacyEth:
+    """Pre-EIP-1559 chain: no eth_feeHistory"""
+
+    def __init__(self):
+        self.gas_price_calls = 0
+
+    async def fee_history(self, *args):
+        raise ValueError("the method eth_feeHistory does not exist/is not available")
+
+    @property
+    async def gas_price(self):
+        self.gas_price_calls += 1
+        return 100
+
+
+class StubWeb3:
+    def __init__(self):
+        self.eth = LegacyEth()
+
+
+def test_legacy_multiplier_is_applied_per_caller():
+    async def main():
+        oracle = GasOracle(StubWeb3(), legacy_price_multiplier=Decimal('1.1'))
+        return (
+            await oracle.fee_fields(),
+            await oracle.fee_fields(Decimal('2.0')),
+            oracle.web3.eth.gas_price_calls,
+        )
+
+    default_fees, custom_fees, gas_price_calls = asyncio.run(main())
+    assert default_fees == {'gasPrice': 110}
+    assert custom_fees == {'gasPrice': 200}
+    # The second caller reused the cached price
+    assert gas_price_calls == 1
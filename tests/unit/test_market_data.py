@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from architecture.market_Data import MarketDataProvider
+
+
+def make_provider(tmp_path, skip_day=None):
+    calls = []
+
+    def historical(symbol, start, end):
+        calls.append((start, end))
+        timestamps = pd.date_range(start, end, freq="6h", inclusive="left", tz="UTC")
+        timestamps = [t for t in timestamps if t.date() != skip_day]
+        return pd.DataFrame({
+            "timestamp": timestamps, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0,
+        })
+
+    provider = MarketDataProvider(["exchange"], str(tmp_path))
+    provider.register_source("exchange", historical=historical)
+    return provider, calls
+
+
+def test_timezone_aware_bounds_are_converted_to_utc(tmp_path):
+    provider, _ = make_provider(tmp_path)
+    start = datetime(2024, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+    bars = provider.fetch_historical("ETH", start, datetime(2024, 1, 2, tzinfo=timezone.utc))
+    assert bars["timestamp"].min() == pd.Timestamp("2024-01-01 00:00")
+    assert len(bars) == 4
+
+
+def test_days_without_bars_are_fetched_again(tmp_path):
+    provider, calls = make_provider(tmp_path, skip_day=datetime(2024, 1, 2).date())
+    provider.fetch_historical("ETH", datetime(2024, 1, 1), datetime(2024, 1, 4))
+    provider.fetch_historical("ETH", datetime(2024, 1, 1), datetime(2024, 1, 4))
+    assert calls[1:] == [(datetime(2024, 1, 2), datetime(2024, 1, 3))]
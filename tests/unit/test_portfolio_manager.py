@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from architecture.portfolio_Manager import PortfolioManager
+
+
+def test_totals_return_to_zero_after_flattening():
+    rng = random.Random(7)
+    book = PortfolioManager()
+    assets = [f"asset_{i}" for i in range(5)]
+    for asset in assets:
+        book.apply_fill({"asset": asset, "side": "buy", "quantity": 3.7, "price": 101.3})
+    for _ in range(30_000):
+        book.update_price(rng.choice(assets), rng.uniform(0.01, 1e6))
+    for asset in assets:
+        book.apply_fill({"asset": asset, "side": "sell", "quantity": 3.7, "price": 99.1})
+
+    assert book.gross_exposure == 0.0
+    assert book.net_exposure == 0.0
+    assert book.unrealized_pnl == 0.0
+
+
+def test_totals_match_positions_while_open():
+    rng = random.Random(11)
+    book = PortfolioManager()
+    book.apply_fill({"asset": "ETH", "side": "buy", "quantity": 2.0, "price": 2000.0})
+    book.apply_fill({"asset": "BTC", "side": "sell", "quantity": 0.5, "price": 40000.0})
+    for _ in range(25_000):
+        book.update_price(rng.choice(["ETH", "BTC"]), rng.uniform(1.0, 1e5))
+
+    positions = book.positions.values()
+    assert book.gross_exposure == pytest.approx(sum(abs(p.exposure) for p in positions))
+    assert book.net_exposure == pytest.approx(sum(p.exposure for p in positions))
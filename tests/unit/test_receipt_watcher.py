@@ -0,0 +1,40 @@
+import asyncio
+
+from security.receipt_Watcher import ReceiptWatcher
+
+
+class StubRPC:
+    """Node stuck on one block where every transaction is already mined"""
+
+    def __init__(self):
+        self.receipt_lookups = 0
+
+    async def request(self, method, params=()):
+        assert method == 'eth_blockNumber'
+        return '0x10'
+
+    async def batch(self, calls, raise_errors=True):
+        self.receipt_lookups += len(calls)
+        return [{'transactionHash': params[0], 'status': '0x1'} for _, params in calls]
+
+
+def test_hash_added_after_block_was_checked_is_looked_up():
+    async def main():
+        watcher = ReceiptWatcher(StubRPC(), poll_interval=0.05)
+        await asyncio.wait_for(watcher.wait_for_receipt('0x' + 'aa' * 32), 1)
+        # Same block as the first lookup: the new hash must still be fetched
+        return await asyncio.wait_for(watcher.wait_for_receipt('0x' + 'bb' * 32), 1)
+
+    second = asyncio.run(main())
+    assert second['transactionHash'] == '0x' + 'bb' * 32
+
+
+def test_poll_interval_applies_only_while_waiting():
+    async def main():
+        watcher = ReceiptWatcher(StubRPC(), poll_interval=0.5)
+        await watcher.wait_for_receipt('0x' + 'cc' * 32, timeout=1, poll_interval=0.01)
+        return watcher
+
+    watcher = asyncio.run(main())
+    assert watcher.poll_interval == 0.5
+    assert watcher._intervals == []
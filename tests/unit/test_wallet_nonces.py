@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+import rlp
+from web3 import AsyncWeb3, Web3
+
+from security.gas_Oracle import GasOracle
+from security.rpc_Client import PooledAsyncProvider
+from security.wallet import KQIWallet, WalletConfig
+
+PRIVATE_KEY = '0x' + '11' * 32
+RECIPIENT = '0x' + '22' * 20
+
+
+class StubRPC:
+    """In-memory JSON-RPC node; `send_outcome` decides how the next send ends"""
+
+    def __init__(self, chain_nonce: int = 5):
+        self.chain_nonce = chain_nonce
+        self.sent_nonces = []
+        self.send_outcome = 'ok'
+
+    async def request_raw(self, method, params):
+        if method == 'eth_getTransactionCount':
+            return self._result(hex(self.chain_nonce))
+        if method == 'eth_chainId':
+            return self._result('0x1')
+        if method == 'eth_estimateGas':
+            return self._result(hex(21000))
+        if method == 'eth_sendRawTransaction':
+            return self._send(params[0])
+        raise AssertionError(f"Unexpected RPC method {method}")
+
+    async def request(self, method, params=()):
+        return (await self.request_raw(method, params))['result']
+
+    def _send(self, raw_hex):
+        outcome, self.send_outcome = self.send_outcome, 'ok'
+        # Legacy transactions are RLP lists starting with the nonce
+        nonce = int.from_bytes(rlp.decode(Web3.to_bytes(hexstr=raw_hex))[0], 'big')
+        if nonce in self.sent_nonces:
+            return {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'replacement transaction underpriced'}}
+        if outcome == 'timeout_before_delivery':
+            raise asyncio.TimeoutError()
+        if outcome == 'rejected':
+            return {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'insufficient funds'}}
+        # Delivered: the node now holds the transaction
+        self.chain_nonce = max(self.chain_nonce, nonce + 1)
+        self.sent_nonces.append(nonce)
+        if outcome == 'timeout_after_delivery':
+            raise asyncio.TimeoutError()
+        if outcome == 'already_known':
+            return {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'already known'}}
+        return self._result(Web3.to_hex(Web3.keccak(hexstr=raw_hex)))
+
+    @staticmethod
+    def _result(value):
+        return {'jsonrpc': '2.0', 'id': 1, 'result': value}
+
+
+def make_wallet(stub: StubRPC) -> KQIWallet:
+    wallet = KQIWallet(WalletConfig(chain_id=1, rpc_url='http://stub.invalid'))
+    wallet.rpc = stub
+    wallet.web3 = AsyncWeb3(PooledAsyncProvider(stub))
+    wallet.gas_oracle = GasOracle(wallet.web3)
+    asyncio.run(wallet.initialize(PRIVATE_KEY))
+    return wallet
+
+
+def send(wallet: KQIWallet) -> str:
+    return asyncio.run(wallet.send_transaction(RECIPIENT, gas_price=10**9))
+
+
+def test_timeout_after_delivery_does_not_reuse_nonce():
+    stub = StubRPC()
+    wallet = make_wallet(stub)
+    stub.send_outcome = 'timeout_after_delivery'
+    with pytest.raises(asyncio.TimeoutError):
+        send(wallet)
+    send(wallet)
+    assert stub.sent_nonces == [5, 6]
+
+
+def test_timeout_before_delivery_reuses_nonce():
+    stub = StubRPC()
+    wallet = make_wallet(stub)
+    stub.send_outcome = 'timeout_before_delivery'
+    with pytest.raises(asyncio.TimeoutError):
+        send(wallet)
+    send(wallet)
+    assert stub.sent_nonces == [5]
+
+
+def test_rejected_send_releases_nonce():
+    stub = StubRPC()
+    wallet = make_wallet(stub)
+    stub.send_outcome = 'rejected'
+    with pytest.raises(Exception, match='insufficient funds'):
+        send(wallet)
+    send(wallet)
+    assert stub.sent_nonces == [5]
+
+
+def test_already_known_counts_as_sent():
+    stub = StubRPC()
+    wallet = make_wallet(stub)
+    stub.send_outcome = 'already_known'
+    tx_hash = send(wallet)
+    assert tx_hash.startswith('0x') and len(tx_hash) == 66
+    send(wallet)
+    assert stub.sent_nonces == [5, 6]
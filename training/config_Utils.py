@@ -5,6 +5,8 @@ from typing import Type, Union
 import yaml
 from pydantic import BaseModel, ValidationError
 
+from core.config_cache import SafeLoader, config_cache, freeze
+
 
 def load_yaml(path: Union[str, Path]) -> dict:
     """
@@ -14,7 +16,7 @@ def load_yaml(path: Union[str, Path]) -> dict:
     if not path.is_file():
         raise FileNotFoundError(f"YAML config not found: {path}")
     with path.open("r") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def load_json(path: Union[str, Path]) -> dict:
@@ -36,6 +38,13 @@ def load_config(
     Load a config file (YAML or JSON), validate it against a Pydantic schema,
     and return the parsed BaseModel instance.
 
+    The parsed file is cached as a frozen (read-only) mapping until its
+    modification time or size changes, so repeated loads of an unchanged
+    file skip parsing. Validation runs on every call and builds a fresh
+    instance, which callers may mutate without affecting each other.
+    Nested values in fields typed `Any` keep their frozen form (read-only
+    mappings and tuples).
+
     :param path: Path to .yaml, .yml, or .json config file
     :param schema: Pydantic BaseModel class for validation
     :returns: instance of schema populated with config values
@@ -47,9 +56,9 @@ def load_config(
 
     ext = path.suffix.lower()
     if ext in (".yml", ".yaml"):  # YAML
-        raw = load_yaml(path)
+        raw = config_cache.load_yaml(path)
     elif ext == ".json":  # JSON
-        raw = load_json(path)
+        raw = config_cache.get(path, "json", lambda p: freeze(load_json(p)))
     else:
         raise ValueError(
             f"Unsupported config format '{ext}'. Use .yaml, .yml, or .json."
@@ -1,6 +1,231 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+
+Source = Union[str, Path, pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def iter_chunks(source: Source, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrame chunks from a CSV or Parquet path, a DataFrame, or an
+    iterable of DataFrames.
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+        return
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize)
+        return
+    yield from source
+
+
+class StreamingPreprocessor:
+    """
+    Out-of-core version of preprocess_data.
+
+    `fit` makes one pass over the chunks to learn column means, category
+    sets and scaler statistics (merged per chunk, so memory does not grow
+    with the row count); `transform` makes a second pass that imputes,
+    label-encodes and standardizes each chunk into preallocated float32
+    arrays or .npy memory maps. The fitted state is saved as JSON and
+    reloaded for inference.
+    """
+    def __init__(self, target: str = "target", dtype=np.float32, chunksize: int = 100_000):
+        self.target = target
+        self.dtype = np.dtype(dtype)
+        self.chunksize = chunksize
+        self.columns: List[str] = []
+        self.means: Dict[str, float] = {}
+        self.categories: Dict[str, List[str]] = {}
+        self.scale_mean: Optional[np.ndarray] = None
+        self.scale_std: Optional[np.ndarray] = None
+        self.target_dtype: Optional[np.dtype] = None
+        self.n_rows = 0
+
+    @property
+    def feature_columns(self) -> List[str]:
+        return [c for c in self.columns if c != self.target]
+
+    def fit(self, source: Source) -> "StreamingPreprocessor":
+        count: Dict[str, int] = {}
+        mean: Dict[str, float] = {}
+        m2: Dict[str, float] = {}
+        category_counts: Dict[str, Dict[str, int]] = {}
+        # Refitting starts from scratch, including on a loaded preprocessor
+        self.columns = []
+        self.means = {}
+        self.categories = {}
+        self.target_dtype = None
+        self.n_rows = 0
+
+        for chunk in iter_chunks(source, self.chunksize):
+            if not self.columns:
+                # Column kinds are fixed by the first chunk; chunked readers infer
+                # dtypes per chunk, so later chunks must not reclassify a column
+                self.columns = list(chunk.columns)
+                for col in self.columns:
+                    if not pd.api.types.is_numeric_dtype(chunk[col].dtype):
+                        category_counts[col] = {}
+                if self.target in chunk:
+                    # Label codes and integral targets stay integers
+                    integral = (self.target in category_counts
+                                or pd.api.types.is_integer_dtype(chunk[self.target].dtype))
+                    self.target_dtype = np.dtype(np.int64) if integral else self.dtype
+            self.n_rows += len(chunk)
+            for col in self.columns:
+                values = chunk[col]
+                if col in category_counts:
+                    counts = category_counts[col]
+                    for value, n in values.dropna().astype(str).value_counts().items():
+                        counts[value] = counts.get(value, 0) + int(n)
+                    continue
+                try:
+                    observed = pd.to_numeric(values.dropna()).to_numpy(dtype=np.float64)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Column {col!r} was numeric in the first chunk but holds non-numeric values")
+                if not len(observed):
+                    continue
+                # Chan's parallel update of count, mean and sum of squared deviations
+                n_a, n_b = count.get(col, 0), len(observed)
+                mean_b = observed.mean()
+                m2_b = ((observed - mean_b) ** 2).sum()
+                delta = mean_b - mean.get(col, 0.0)
+                total = n_a + n_b
+                mean[col] = mean.get(col, 0.0) + delta * n_b / total
+                m2[col] = m2.get(col, 0.0) + m2_b + delta ** 2 * n_a * n_b / total
+                count[col] = total
+
+        self.means = {col: mean.get(col, 0.0) for col in self.columns if col not in category_counts}
+        # LabelEncoder codes are the positions of the sorted classes
+        self.categories = {col: sorted(counts) for col, counts in category_counts.items()}
+
+        scale_mean, scale_std = [], []
+        for col in self.feature_columns:
+            if col in self.categories:
+                codes = np.arange(len(self.categories[col]), dtype=np.float64)
+                weights = np.array([category_counts[col][c] for c in self.categories[col]], dtype=np.float64)
+                missing = self.n_rows - weights.sum()
+                codes, weights = np.append(codes, -1.0), np.append(weights, missing)
+                mu = (codes * weights).sum() / self.n_rows
+                var = (weights * (codes - mu) ** 2).sum() / self.n_rows
+            else:
+                # Imputed rows sit exactly on the mean and add no variance
+                mu = self.means[col]
+                var = m2.get(col, 0.0) / self.n_rows if self.n_rows else 0.0
+            scale_mean.append(mu)
+            scale_std.append(np.sqrt(var) if var > 0 else 1.0)
+        self.scale_mean = np.array(scale_mean)
+        self.scale_std = np.array(scale_std)
+        return self
+
+    def transform_chunk(self, chunk: pd.DataFrame) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Impute, encode and standardize one chunk without modifying it."""
+        features = np.empty((len(chunk), len(self.feature_columns)), dtype=np.float64)
+        for i, col in enumerate(self.feature_columns):
+            features[:, i] = self._encode(chunk[col], col)
+        features -= self.scale_mean
+        features /= self.scale_std
+        y = self._encode(chunk[self.target], self.target) if self.target in chunk else None
+        return features.astype(self.dtype, copy=False), y
+
+    def transform(self, source: Source, out_dir: Optional[Union[str, Path]] = None,
+                  n_rows: Optional[int] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Second pass: return (X, y) for every chunk in `source`.
+
+        With `out_dir`, X and y are written to `X.npy`/`y.npy` memory maps
+        (reopen with `np.load(path, mmap_mode="r")`). `n_rows` defaults to
+        the row count seen by `fit`, i.e. transforming the fitted source.
+        """
+        n_rows = self.n_rows if n_rows is None else n_rows
+        y_dtype = self.target_dtype or self.dtype
+        if out_dir is not None:
+            out_dir = Path(out_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            X = np.lib.format.open_memmap(out_dir / "X.npy", mode="w+", dtype=self.dtype,
+                                          shape=(n_rows, len(self.feature_columns)))
+            y = np.lib.format.open_memmap(out_dir / "y.npy", mode="w+", dtype=y_dtype, shape=(n_rows,))
+        else:
+            X = np.empty((n_rows, len(self.feature_columns)), dtype=self.dtype)
+            y = np.empty(n_rows, dtype=y_dtype)
+
+        offset, has_target = 0, False
+        for chunk in iter_chunks(source, self.chunksize):
+            X_chunk, y_chunk = self.transform_chunk(chunk)
+            X[offset:offset + len(chunk)] = X_chunk
+            if y_chunk is not None:
+                y[offset:offset + len(chunk)] = y_chunk
+                has_target = True
+            offset += len(chunk)
+        if offset != n_rows:
+            raise ValueError(f"Expected {n_rows} rows, read {offset}")
+        if isinstance(X, np.memmap):
+            X.flush()
+            y.flush()
+        return X, (y if has_target else None)
+
+    def fit_transform(self, source: Source, out_dir: Optional[Union[str, Path]] = None):
+        """
+        Fit on `source`, then transform it. Both passes read the source, so
+        one-shot iterators (generators, chunked `read_csv` readers) are
+        rejected; pass a path, a DataFrame or a list of chunks instead.
+        """
+        if not isinstance(source, (str, Path, pd.DataFrame)) and iter(source) is source:
+            raise TypeError("fit_transform needs a source it can read twice, not a one-shot iterator")
+        return self.fit(source).transform(source, out_dir)
+
+    def _encode(self, values: pd.Series, col: str) -> np.ndarray:
+        if col in self.categories:
+            # Unseen and missing categories encode as -1
+            labels = values.where(values.isna(), values.astype(str))
+            codes = pd.Categorical(labels, categories=self.categories[col]).codes
+            return codes.astype(np.float64) if col != self.target else codes.astype(np.int64)
+        return values.astype(np.float64).fillna(self.means[col]).to_numpy()
+
+    def save(self, path: Union[str, Path]):
+        """Write the fitted state to a JSON file."""
+        state = {
+            "target": self.target,
+            "dtype": self.dtype.name,
+            "columns": self.columns,
+            "means": self.means,
+            "categories": self.categories,
+            "scale_mean": self.scale_mean.tolist(),
+            "scale_std": self.scale_std.tolist(),
+            "target_dtype": self.target_dtype.name if self.target_dtype is not None else None,
+            "n_rows": self.n_rows,
+        }
+        Path(path).write_text(json.dumps(state, indent=2))
+
+    @classmethod
+    def load(cls, path: Union[str, Path], chunksize: int = 100_000) -> "StreamingPreprocessor":
+        """Restore a preprocessor saved with `save`."""
+        state = json.loads(Path(path).read_text())
+        preprocessor = cls(state["target"], state["dtype"], chunksize)
+        preprocessor.columns = state["columns"]
+        preprocessor.means = state["means"]
+        preprocessor.categories = state["categories"]
+        preprocessor.scale_mean = np.array(state["scale_mean"])
+        preprocessor.scale_std = np.array(state["scale_std"])
+        preprocessor.n_rows = state["n_rows"]
+        if state.get("target_dtype"):
+            preprocessor.target_dtype = np.dtype(state["target_dtype"])
+        elif preprocessor.target in preprocessor.categories:
+            # Saved before target_dtype was recorded
+            preprocessor.target_dtype = np.dtype(np.int64)
+        return preprocessor
+
 
 def preprocess_data(data: pd.DataFrame) -> tuple:
     """
@@ -12,19 +237,4 @@ def preprocess_data(data: pd.DataFrame) -> tuple:
     Returns:
         tuple: (X, y) where X is the feature matrix and y is the label vector.
     """
-    # Handle missing values
-    data = data.fillna(data.mean())
-
-    # Encode categorical variables
-    categorical_cols = data.select_dtypes(include=["object"]).columns
-    for col in categorical_cols:
-        data[col] = LabelEncoder().fit_transform(data[col])
-
-    # Separate features and labels
-    X = data.drop("target", axis=1).values
-    y = data["target"].values
-
-    # Normalize features
-    X = StandardScaler().fit_transform(X)
-
-    return X, y
+    return StreamingPreprocessor(dtype=np.float64).fit_transform(data)
@@ -1,30 +1,346 @@
+import json
+import logging
+import math
+import os
+import random
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
 import yaml
 from sklearn.model_selection import ParameterGrid
-from training_scripts import train_agent  # your existing entrypoint
-from model_evaluation import evaluate_agent
+
+logger = logging.getLogger("KQI Hyperparameter Search")
+
+# objective(params, budget) -> score; budget is None unless early stopping is configured
+Objective = Callable[[Dict[str, Any], Optional[float]], float]
+
 
 def load_config(path="config/hp_search.yaml"):
     with open(path) as f:
         return yaml.safe_load(f)
 
-def main():
-    cfg = load_config()
-    param_grid = list(ParameterGrid(cfg["hyperparameters"]))
-    best_score, best_params = -float("inf"), None
 
-    for params in param_grid:
-        print(f"→ Training with params: {params}")
-        model = train_agent(**params)
-        score = evaluate_agent(model, cfg["eval_dataset"])
-        print(f"   Score: {score:.4f}")
+class SearchSpace:
+    """
+    Hyperparameter space from the `hyperparameters` config section.
+
+    A list is a set of choices (what ParameterGrid expects); a mapping with
+    `low`/`high` (and optional `log: true`, `type: int`) is a continuous
+    range, usable by the random and Bayesian samplers only.
+    """
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = dict(spec)
+        self.names = sorted(self.spec)
+
+    def grid(self) -> List[Dict[str, Any]]:
+        ranges = [n for n in self.names if not isinstance(self.spec[n], list)]
+        if ranges:
+            raise ValueError(f"Grid search needs lists of choices; got ranges for {ranges}")
+        return list(ParameterGrid(self.spec))
+
+    def sample(self, rng: random.Random) -> Dict[str, Any]:
+        params = {}
+        for name in self.names:
+            dim = self.spec[name]
+            if isinstance(dim, list):
+                params[name] = rng.choice(dim)
+                continue
+            low, high = dim["low"], dim["high"]
+            if dim.get("log"):
+                value = math.exp(rng.uniform(math.log(low), math.log(high)))
+            else:
+                value = rng.uniform(low, high)
+            params[name] = int(round(value)) if dim.get("type") == "int" else value
+        return params
+
+    def encode(self, params: Dict[str, Any]) -> List[float]:
+        """Map params into the unit cube for the surrogate model."""
+        point = []
+        for name in self.names:
+            dim, value = self.spec[name], params[name]
+            if isinstance(dim, list):
+                point.append(dim.index(value) / max(len(dim) - 1, 1))
+            elif dim.get("log"):
+                point.append(math.log(value / dim["low"]) / math.log(dim["high"] / dim["low"]))
+            else:
+                point.append((value - dim["low"]) / (dim["high"] - dim["low"]))
+        return point
+
+
+class GridSampler:
+    def __init__(self, space: SearchSpace, **_):
+        self._points = space.grid()
+
+    @property
+    def n_trials(self) -> int:
+        return len(self._points)
+
+    def suggest(self, trial_id: int, history: List[Tuple[Dict, float]]) -> Dict[str, Any]:
+        return self._points[trial_id]
+
+
+class RandomSampler:
+    def __init__(self, space: SearchSpace, n_trials: int = 50, seed: Optional[int] = None, **_):
+        self.space = space
+        self.n_trials = n_trials
+        self.seed = seed
+
+    def suggest(self, trial_id: int, history: List[Tuple[Dict, float]]) -> Dict[str, Any]:
+        # Seeded per trial so a resumed search proposes the same candidates
+        return self.space.sample(self._rng(trial_id))
+
+    def _rng(self, trial_id: int) -> random.Random:
+        return random.Random(None if self.seed is None else f"{self.seed}:{trial_id}")
+
+
+class BayesianSampler(RandomSampler):
+    """
+    Gaussian-process surrogate with expected improvement.
+
+    The first `n_startup` trials are random; after that each suggestion
+    scores `n_candidates` random points on the surrogate fitted to all
+    finished trials and picks the most promising one.
+    """
+    def __init__(self, space: SearchSpace, n_trials: int = 50, seed: Optional[int] = None,
+                 n_startup: int = 10, n_candidates: int = 512, **_):
+        super().__init__(space, n_trials, seed)
+        self.n_startup = n_startup
+        self.n_candidates = n_candidates
+
+    def suggest(self, trial_id: int, history: List[Tuple[Dict, float]]) -> Dict[str, Any]:
+        if len(history) < self.n_startup:
+            return super().suggest(trial_id, history)
+        from scipy.stats import norm
+        from sklearn.exceptions import ConvergenceWarning
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import Matern, WhiteKernel
+
+        X = np.array([self.space.encode(params) for params, _ in history])
+        y = np.array([score for _, score in history])
+        gp = GaussianProcessRegressor(Matern(nu=2.5) + WhiteKernel(), normalize_y=True, random_state=0)
+        with warnings.catch_warnings():
+            # Kernel hyperparameters hitting their bounds is expected on small histories
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            gp.fit(X, y)
+
+        rng = self._rng(trial_id)
+        candidates = [self.space.sample(rng) for _ in range(self.n_candidates)]
+        mean, std = gp.predict(np.array([self.space.encode(c) for c in candidates]), return_std=True)
+        std = np.maximum(std, 1e-12)
+        z = (mean - y.max()) / std
+        expected_improvement = (mean - y.max()) * norm.cdf(z) + std * norm.pdf(z)
+        return candidates[int(np.argmax(expected_improvement))]
+
 
-        if score > best_score:
-            best_score, best_params = score, params
+SAMPLERS = {
+    "grid": GridSampler,
+    "random": RandomSampler,
+    "successive_halving": RandomSampler,
+    "bayesian": BayesianSampler,
+}
+
+
+@dataclass
+class Trial:
+    trial_id: int
+    params: Dict[str, Any]
+    scores: Dict[int, float] = field(default_factory=dict)  # rung -> score
+    state: str = "running"  # running | complete | pruned | failed
+
+    @property
+    def score(self) -> Optional[float]:
+        return self.scores[max(self.scores)] if self.scores else None
+
+
+class HyperparameterSearch:
+    """
+    Runs trials of `objective` across a process pool.
+
+    With `min_budget`/`max_budget`, each trial is trained in rungs of
+    increasing budget (multiplied by `eta`) and is only promoted to the next
+    rung while its score is in the top 1/eta of all scores seen at that rung;
+    this is asynchronous successive halving and applies to every sampler.
+    Every created trial and finished rung is appended to `checkpoint_path`
+    (JSON lines), so rerunning an interrupted search resumes where it left off.
+    Scores are maximized.
+    """
+    def __init__(
+        self,
+        objective: Objective,
+        space: Dict[str, Any],
+        sampler: str = "grid",
+        n_trials: int = 50,
+        n_jobs: Optional[int] = None,
+        min_budget: Optional[float] = None,
+        max_budget: Optional[float] = None,
+        eta: int = 3,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        seed: Optional[int] = None,
+        **sampler_options,
+    ):
+        if sampler not in SAMPLERS:
+            raise ValueError(f"Unknown sampler '{sampler}'; choose from {sorted(SAMPLERS)}")
+        if sampler == "successive_halving" and (min_budget is None or max_budget is None):
+            raise ValueError("successive_halving needs min_budget and max_budget")
+        self.objective = objective
+        self.space = SearchSpace(space)
+        self.sampler = SAMPLERS[sampler](self.space, n_trials=n_trials, seed=seed, **sampler_options)
+        self.n_trials = self.sampler.n_trials
+        self.n_jobs = n_jobs
+        self.eta = eta
+        self.budgets = self._budgets(min_budget, max_budget, eta)
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.trials: Dict[int, Trial] = {}
+        self._rung_scores: Dict[int, List[float]] = {}
+
+    @staticmethod
+    def _budgets(min_budget, max_budget, eta) -> List[Optional[float]]:
+        if min_budget is None or max_budget is None:
+            return [None]
+        budgets = [min_budget]
+        while budgets[-1] * eta < max_budget:
+            budgets.append(budgets[-1] * eta)
+        if budgets[-1] < max_budget:
+            budgets.append(max_budget)
+        return budgets
+
+    def run(self) -> Trial:
+        """Run (or resume) the search and return the best completed trial."""
+        self._load_checkpoint()
+        pending = [t for t in self.trials.values() if t.state == "running"]
+        next_id = max(self.trials, default=-1) + 1
+        running: Dict[Future, Tuple[Trial, int]] = {}
+
+        workers = self.n_jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                while len(running) < workers and (pending or next_id < self.n_trials):
+                    if pending:
+                        trial = pending.pop()
+                    else:
+                        trial = self._create_trial(next_id)
+                        next_id += 1
+                    rung = len(trial.scores)
+                    future = pool.submit(self.objective, trial.params, self.budgets[rung])
+                    running[future] = (trial, rung)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial, rung = running.pop(future)
+                    if self._finish_rung(trial, rung, future) == "running":
+                        pending.append(trial)
+
+        return self.best_trial()
+
+    def best_trial(self) -> Optional[Trial]:
+        complete = [t for t in self.trials.values() if t.state == "complete"]
+        return max(complete, key=lambda t: t.score, default=None)
+
+    def _create_trial(self, trial_id: int) -> Trial:
+        history = [(t.params, t.score) for t in self.trials.values() if t.state == "complete"]
+        trial = Trial(trial_id, self.sampler.suggest(trial_id, history))
+        self.trials[trial_id] = trial
+        self._record({"event": "created", "trial_id": trial_id, "params": trial.params})
+        return trial
+
+    def _finish_rung(self, trial: Trial, rung: int, future: Future) -> str:
+        try:
+            score = float(future.result())
+        except Exception as e:
+            logger.error(f"Trial {trial.trial_id} failed at rung {rung}: {e}")
+            trial.state = "failed"
+            self._record({"event": "failed", "trial_id": trial.trial_id, "rung": rung, "error": str(e)})
+            return trial.state
+
+        trial.scores[rung] = score
+        self._rung_scores.setdefault(rung, []).append(score)
+        if rung == len(self.budgets) - 1:
+            trial.state = "complete"
+        elif not self._promote(rung, score):
+            trial.state = "pruned"
+        logger.info(f"Trial {trial.trial_id} rung {rung}: {score:.4f} ({trial.state})")
+        self._record({"event": "rung", "trial_id": trial.trial_id, "rung": rung, "score": score, "state": trial.state})
+        return trial.state
+
+    def _promote(self, rung: int, score: float) -> bool:
+        scores = self._rung_scores[rung]
+        if len(scores) < self.eta:
+            return True
+        keep = max(1, len(scores) // self.eta)
+        return score >= sorted(scores, reverse=True)[keep - 1]
+
+    def _record(self, event: Dict):
+        if self.checkpoint_path is None:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.checkpoint_path.open("a") as f:
+            f.write(json.dumps(event, default=str) + "\n")
+            f.flush()
+
+    def _load_checkpoint(self):
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return
+        with self.checkpoint_path.open() as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write; that rung reruns
+                    continue
+                if event["event"] == "created":
+                    self.trials[event["trial_id"]] = Trial(event["trial_id"], event["params"])
+                    continue
+                trial = self.trials[event["trial_id"]]
+                if event["event"] == "failed":
+                    trial.state = "failed"
+                else:
+                    trial.scores[event["rung"]] = event["score"]
+                    trial.state = event["state"]
+                    self._rung_scores.setdefault(event["rung"], []).append(event["score"])
+        logger.info(f"Resumed {len(self.trials)} trials from {self.checkpoint_path}")
+
+
+def train_and_evaluate(params: Dict[str, Any], budget: Optional[float], eval_dataset: str,
+                       budget_param: str = "num_epochs") -> float:
+    """Default objective: train an agent with `params` and score it on `eval_dataset`."""
+    from training_scripts import train_agent  # your existing entrypoint
+    from model_evaluation import evaluate_agent
+
+    if budget is not None:
+        params = {**params, budget_param: int(budget)}
+    model = train_agent(**params)
+    return evaluate_agent(model, eval_dataset)
+
+
+def main():
+    cfg = load_config()
+    search_cfg = dict(cfg.get("search", {}))
+    objective = partial(
+        train_and_evaluate,
+        eval_dataset=cfg["eval_dataset"],
+        budget_param=search_cfg.pop("budget_param", "num_epochs"),
+    )
+    search = HyperparameterSearch(
+        objective,
+        cfg["hyperparameters"],
+        checkpoint_path=search_cfg.pop("checkpoint", "hp_search_trials.jsonl"),
+        **search_cfg,
+    )
+    best = search.run()
+    if best is None:
+        print("No trial completed")
+        return
 
-    print(f"✅ Best score: {best_score:.4f} @ {best_params}")
+    print(f"✅ Best score: {best.score:.4f} @ {best.params}")
     # dump best_params to disk
     with open("best_params.yaml", "w") as f:
-        yaml.safe_dump(best_params, f)
+        yaml.safe_dump(best.params, f)
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,12 @@
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from models.performance_Model import PerformanceModel
 
 
 def compute_sharpe(returns: pd.Series, risk_free_rate: float = 0.0) -> float:
@@ -34,20 +40,50 @@ def compute_win_loss_ratio(returns: pd.Series) -> float:
     return wins / losses if losses > 0 else np.inf
 
 
-def evaluate_agent(equity: pd.Series, title: str = "Agent Performance") -> dict:
+def compute_metrics_matrix(equity: np.ndarray, risk_free_rate: float = 0.0) -> Dict[str, np.ndarray]:
     """
-    Aggregate performance metrics and plot equity curve.
-    Returns a dict of metrics.
+    Compute the evaluate_agent metrics for many equity curves in one pass.
+    equity: 2-D array with time along axis 0 and one curve per column
+    Returns a dict of per-column metric arrays, matching the single-series functions.
     """
-    # Compute periodic returns
-    returns = equity.pct_change().dropna()
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.ndim == 1:
+        equity = equity[:, None]
+    returns = equity[1:] / equity[:-1] - 1.0
+    n = len(returns)
 
-    sharpe = compute_sharpe(returns)
-    max_dd = compute_max_drawdown(equity)
-    wl_ratio = compute_win_loss_ratio(returns)
-    total_return = equity.iloc[-1] / equity.iloc[0] - 1
+    rf_per_period = (1 + risk_free_rate) ** (1 / n) - 1 if n else 0.0
+    excess = returns - rf_per_period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = excess.std(axis=0, ddof=1) if n > 1 else np.full(equity.shape[1], np.nan)
+        sharpe = np.sqrt(n) * excess.mean(axis=0) / std
 
-    # Plot equity curve
+        cum_max = np.maximum.accumulate(equity, axis=0)
+        max_drawdown = ((equity - cum_max) / cum_max).min(axis=0)
+
+        wins = (returns > 0).sum(axis=0)
+        losses = (returns < 0).sum(axis=0)
+        win_loss = np.where(losses > 0, wins / np.maximum(losses, 1), np.inf)
+
+    return {
+        "sharpe_ratio": sharpe,
+        "max_drawdown": max_drawdown,
+        "win_loss_ratio": win_loss,
+        "total_return": equity[-1] / equity[0] - 1.0,
+    }
+
+
+def plot_equity_curve(equity: pd.Series, title: str = "Agent Performance",
+                      output_dir: Union[str, Path] = ".") -> Path:
+    """
+    Render an equity curve to `<output_dir>/<title>_equity.png`.
+    matplotlib is only imported here, so evaluation runs without it.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    path = Path(output_dir) / f"{title.replace(' ', '_').lower()}_equity.png"
     plt.figure(figsize=(10, 6))
     plt.plot(equity.index, equity.values)
     plt.title(title)
@@ -55,8 +91,346 @@ def evaluate_agent(equity: pd.Series, title: str = "Agent Performance") -> dict:
     plt.ylabel("Portfolio Value")
     plt.grid(True)
     plt.tight_layout()
-    plt.savefig(f"{title.replace(' ', '_').lower()}_equity.png")
+    plt.savefig(path)
     plt.close()
+    return path
+
+
+@dataclass
+class EvaluationResult:
+    """
+    Metrics for a batch of equity curves; plots are rendered only on request.
+    """
+    equity: pd.DataFrame
+    metrics: pd.DataFrame
+
+    def top(self, metric: str = "sharpe_ratio", n: int = 10) -> pd.DataFrame:
+        return self.metrics.nlargest(n, metric)
+
+    def plot(self, names: Optional[Sequence] = None, output_dir: Union[str, Path] = ".") -> List[Path]:
+        """Render equity curves for `names` (default: all columns)."""
+        names = self.equity.columns if names is None else names
+        return [plot_equity_curve(self.equity[name], str(name), output_dir) for name in names]
+
+
+def evaluate_agents(equity: Union[pd.DataFrame, np.ndarray], risk_free_rate: float = 0.0) -> EvaluationResult:
+    """
+    Evaluate every column of an equity matrix (agents or parameter sets) at once.
+    Returns an EvaluationResult with one metrics row per column.
+    """
+    frame = equity if isinstance(equity, pd.DataFrame) else pd.DataFrame(np.asarray(equity))
+    metrics = compute_metrics_matrix(frame.to_numpy(dtype=np.float64), risk_free_rate)
+    return EvaluationResult(equity=frame, metrics=pd.DataFrame(metrics, index=frame.columns))
+
+
+def rolling_metrics(equity: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """
+    Rolling-window mean return, volatility, Sharpe (per period, not annualized)
+    and win/loss ratio for an equity matrix, via cumulative sums.
+    Row t covers the `window` returns ending at step t; earlier rows are NaN.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.ndim == 1:
+        equity = equity[:, None]
+    returns = equity[1:] / equity[:-1] - 1.0
+
+    def window_sum(values: np.ndarray) -> np.ndarray:
+        cumsum = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), values]), axis=0)
+        out = np.full((len(equity), values.shape[1]), np.nan)
+        out[window:] = cumsum[window:] - cumsum[:-window]
+        return out
+
+    mean = window_sum(returns) / window
+    var = (window_sum(returns ** 2) - window * mean ** 2) / max(window - 1, 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+    wins = window_sum((returns > 0).astype(np.float64))
+    losses = window_sum((returns < 0).astype(np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "mean_return": mean,
+            "volatility": std,
+            "sharpe_ratio": mean / std,
+            "win_loss_ratio": np.where(losses > 0, wins / losses, np.where(np.isnan(losses), np.nan, np.inf)),
+        }
+
+
+class RollingMetrics:
+    """
+    Live rolling-window metrics for one or many agents.
+    Each `update(equity)` takes the latest equity value(s) and costs O(1)
+    per agent: returns sit in a ring buffer and window sums are adjusted by
+    the entering and leaving return, then recomputed exactly once per
+    window to stop floating-point drift.
+    """
+    def __init__(self, window: int, n_series: int = 1):
+        self.window = window
+        self._returns = np.zeros((window, n_series))
+        self._sum = np.zeros(n_series)
+        self._sum_sq = np.zeros(n_series)
+        self._wins = np.zeros(n_series)
+        self._losses = np.zeros(n_series)
+        self._last: Optional[np.ndarray] = None
+        self._peak = np.full(n_series, -np.inf)
+        self._drawdown = np.zeros(n_series)
+        self.count = 0
+
+    def update(self, equity) -> Dict[str, np.ndarray]:
+        equity = np.atleast_1d(np.asarray(equity, dtype=np.float64))
+        self._peak = np.maximum(self._peak, equity)
+        self._drawdown = (equity - self._peak) / self._peak
+        if self._last is not None:
+            r = equity / self._last - 1.0
+            slot = self.count % self.window
+            old = self._returns[slot]
+            if self.count >= self.window:
+                self._sum -= old
+                self._sum_sq -= old ** 2
+                self._wins -= old > 0
+                self._losses -= old < 0
+            self._returns[slot] = r
+            self._sum += r
+            self._sum_sq += r ** 2
+            self._wins += r > 0
+            self._losses += r < 0
+            self.count += 1
+            if self.count % self.window == 0:
+                self._sum = self._returns.sum(axis=0)
+                self._sum_sq = (self._returns ** 2).sum(axis=0)
+        self._last = equity
+        return self.values()
+
+    def values(self) -> Dict[str, np.ndarray]:
+        n = min(self.count, self.window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self._sum / n if n else np.full_like(self._sum, np.nan)
+            var = (self._sum_sq - n * mean ** 2) / (n - 1) if n > 1 else np.full_like(self._sum, np.nan)
+            std = np.sqrt(np.maximum(var, 0.0))
+            return {
+                "mean_return": mean,
+                "volatility": std,
+                "sharpe_ratio": mean / std,
+                "win_loss_ratio": np.where(self._losses > 0, self._wins / self._losses, np.inf),
+                "drawdown": self._drawdown,
+            }
+
+
+class RunningStats:
+    """
+    Welford running mean and variance; mergeable with Chan's parallel formula.
+    """
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        merged = RunningStats()
+        merged.count = self.count + other.count
+        if merged.count:
+            delta = other.mean - self.mean
+            merged.mean = self.mean + delta * other.count / merged.count
+            merged.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / merged.count
+        return merged
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), like pandas."""
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+
+class RunningDrawdown:
+    """
+    Running peak and maximum drawdown of an equity stream.
+    max_drawdown is negative, like compute_max_drawdown.
+    """
+    __slots__ = ("peak", "max_drawdown", "low", "low_before_peak")
+
+    def __init__(self):
+        self.peak = float("-inf")
+        self.max_drawdown = 0.0
+        self.low = float("inf")
+        self.low_before_peak = float("inf")
+
+    def update(self, equity: float):
+        if equity > self.peak:
+            self.peak = equity
+            self.low_before_peak = self.low
+        self.low = min(self.low, equity)
+        self.max_drawdown = min(self.max_drawdown, (equity - self.peak) / self.peak)
+
+    def merge(self, later: "RunningDrawdown") -> "RunningDrawdown":
+        """
+        Combine with the shard that follows this one in time.
+        Exact unless `later` makes a new overall high, in which case the
+        drawdown of its points before that high is measured against this
+        shard's peak, which can only overstate it.
+        """
+        merged = RunningDrawdown()
+        merged.max_drawdown = min(self.max_drawdown, later.max_drawdown)
+        trough = later.low if later.peak <= self.peak else later.low_before_peak
+        if self.peak > float("-inf") and trough < float("inf"):
+            merged.max_drawdown = min(merged.max_drawdown, (trough - self.peak) / self.peak)
+        merged.peak = max(self.peak, later.peak)
+        merged.low = min(self.low, later.low)
+        merged.low_before_peak = self.low_before_peak if self.peak >= later.peak else min(self.low, later.low_before_peak)
+        return merged
+
+
+class WinLossCounter:
+    """
+    Counts and sums of positive and negative returns.
+    """
+    __slots__ = ("wins", "losses", "gross_win", "gross_loss")
+
+    def __init__(self):
+        self.wins = 0
+        self.losses = 0
+        self.gross_win = 0.0
+        self.gross_loss = 0.0
+
+    def update(self, r: float):
+        if r > 0:
+            self.wins += 1
+            self.gross_win += r
+        elif r < 0:
+            self.losses += 1
+            self.gross_loss -= r
+
+    def merge(self, other: "WinLossCounter") -> "WinLossCounter":
+        merged = WinLossCounter()
+        merged.wins = self.wins + other.wins
+        merged.losses = self.losses + other.losses
+        merged.gross_win = self.gross_win + other.gross_win
+        merged.gross_loss = self.gross_loss + other.gross_loss
+        return merged
+
+    @property
+    def ratio(self) -> float:
+        return self.wins / self.losses if self.losses > 0 else np.inf
+
+    @property
+    def profit_factor(self) -> float:
+        return self.gross_win / self.gross_loss if self.gross_loss > 0 else np.inf
+
+
+class OnlineMetrics:
+    """
+    Streaming counterpart of evaluate_agent for live agents.
+    Each `update(equity)` is O(1) in time and memory and no history is kept.
+    Shards of one series can be evaluated separately and combined with
+    `merge`, which also accounts for the return across the shard boundary.
+    """
+    __slots__ = ("first", "last", "returns", "drawdown", "win_loss")
+
+    def __init__(self):
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.returns = RunningStats()
+        self.drawdown = RunningDrawdown()
+        self.win_loss = WinLossCounter()
+
+    def update(self, equity: float):
+        equity = float(equity)
+        if self.last is None:
+            self.first = equity
+        else:
+            r = equity / self.last - 1.0
+            self.returns.update(r)
+            self.win_loss.update(r)
+        self.drawdown.update(equity)
+        self.last = equity
+
+    def merge(self, later: "OnlineMetrics") -> "OnlineMetrics":
+        """Combine with the shard that follows this one in time."""
+        if self.last is None:
+            return later
+        if later.last is None:
+            return self
+        merged = OnlineMetrics()
+        merged.first, merged.last = self.first, later.last
+        boundary = RunningStats()
+        boundary.update(later.first / self.last - 1.0)
+        merged.returns = self.returns.merge(boundary).merge(later.returns)
+        boundary_win_loss = WinLossCounter()
+        boundary_win_loss.update(later.first / self.last - 1.0)
+        merged.win_loss = self.win_loss.merge(boundary_win_loss).merge(later.win_loss)
+        merged.drawdown = self.drawdown.merge(later.drawdown)
+        return merged
+
+    @property
+    def total_return(self) -> float:
+        return self.last / self.first - 1.0 if self.first else 0.0
+
+    @property
+    def sharpe_ratio(self) -> float:
+        """Same convention as compute_sharpe with a zero risk-free rate."""
+        std = self.returns.std
+        return np.sqrt(self.returns.count) * self.returns.mean / std if std > 0 else float("nan")
+
+    @property
+    def current_drawdown(self) -> float:
+        return (self.last - self.drawdown.peak) / self.drawdown.peak if self.last is not None else 0.0
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "sharpe_ratio": self.sharpe_ratio,
+            "max_drawdown": self.drawdown.max_drawdown,
+            "win_loss_ratio": self.win_loss.ratio,
+            "total_return": self.total_return,
+        }
+
+    def to_performance_model(self, timestamp: Optional[datetime] = None,
+                             periods_per_year: Optional[float] = None) -> PerformanceModel:
+        """
+        Snapshot as a PerformanceModel; volatility is annualized when
+        `periods_per_year` is given and max_drawdown is reported as a positive fraction.
+        """
+        volatility = self.returns.std if self.returns.count > 1 else 0.0
+        if periods_per_year:
+            volatility *= np.sqrt(periods_per_year)
+        return PerformanceModel(
+            timestamp=timestamp or datetime.utcnow(),
+            total_return=self.total_return,
+            volatility=volatility,
+            max_drawdown=-self.drawdown.max_drawdown,
+            metrics={
+                "sharpe_ratio": self.sharpe_ratio,
+                "win_loss_ratio": self.win_loss.ratio,
+                "profit_factor": self.win_loss.profit_factor,
+                "current_drawdown": self.current_drawdown,
+                "observations": self.returns.count + 1,
+            },
+        )
+
+
+def evaluate_agent(equity: pd.Series, title: str = "Agent Performance", plot: bool = True) -> dict:
+    """
+    Aggregate performance metrics and plot equity curve.
+    Returns a dict of metrics; pass plot=False to skip rendering.
+    """
+    # Compute periodic returns
+    returns = equity.pct_change().dropna()
+
+    sharpe = compute_sharpe(returns)
+    max_dd = compute_max_drawdown(equity)
+    wl_ratio = compute_win_loss_ratio(returns)
+    total_return = equity.iloc[-1] / equity.iloc[0] - 1
+
+    # Plot equity curve
+    if plot:
+        plot_equity_curve(equity, title)
 
     metrics = {
         "sharpe_ratio": sharpe,
@@ -66,4 +440,5 @@ def evaluate_agent(equity: pd.Series, title: str = "Agent Performance") -> dict:
     }
 
     # Optionally print or log
-    print("Performance met
+    print("Performance metrics:", metrics)
+    return metrics
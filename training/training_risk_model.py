@@ -1,10 +1,10 @@
-import pandas as pd
 from models.risk_assessor import RiskAssessor
-from training.data_preprocessing import preprocess_data
+from training.data_processing import StreamingPreprocessor
 
-# Load data
-data = pd.read_csv("data/risk_data.csv")
-X, y = preprocess_data(data)
+# Preprocess in chunks; X and y are memory-mapped from disk
+preprocessor = StreamingPreprocessor()
+X, y = preprocessor.fit_transform("data/risk_data.csv", out_dir="data/processed/risk")
+preprocessor.save("data/processed/risk/preprocessor.json")
 
 # Train the model
 assessor = RiskAssessor()
@@ -1,10 +1,10 @@
-import pandas as pd
 from models.strategy_predictor import StrategyPredictor
-from training.data_preprocessing import preprocess_data
+from training.data_processing import StreamingPreprocessor
 
-# Load data
-data = pd.read_csv("data/strategy_data.csv")
-X, y = preprocess_data(data)
+# Preprocess in chunks; X and y are memory-mapped from disk
+preprocessor = StreamingPreprocessor()
+X, y = preprocessor.fit_transform("data/strategy_data.csv", out_dir="data/processed/strategy")
+preprocessor.save("data/processed/strategy/preprocessor.json")
 
 # Train the model
 predictor = StrategyPredictor()